@@ -0,0 +1,158 @@
+"""
+Running per-team, per-competition match aggregates stored on TeamInfo.
+
+Every played match contributes one match, its fuel scored, auto fuel and
+climb points to each team on the field. Saving a match applies only the
+difference between its old and new contributions; recompute_competition()
+rebuilds everything from the matches as a fallback.
+"""
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast
+from ..models import TeamInfo, Match
+from ..participants import SLOTS
+from ..versioning import bump_data_version
+
+CLIMB_POINTS = {'L1': 3, 'L2': 6, 'L3': 10}
+
+# Running totals on TeamInfo, in the order of a contribution vector
+TOTAL_FIELDS = ['matches_played', 'total_fuel_scored', 'total_auto_fuel', 'total_climb_points']
+
+# Averages derived from the totals
+AVERAGE_FIELDS = {
+    'avg_fuel_scored': 'total_fuel_scored',
+    'avg_auto_fuel': 'total_auto_fuel',
+    'avg_climb_points': 'total_climb_points',
+}
+
+STAT_FIELDS = ['competition_id', 'has_played', 'match_type', 'total_blue_fuels', 'total_red_fuels'] + [
+    field
+    for alliance, station in SLOTS
+    for field in (
+        f'{alliance}_team_{station}_id',
+        f'{alliance}_{station}_fuel_scored',
+        f'{alliance}_{station}_auto_fuel',
+        f'{alliance}_{station}_climb',
+    )
+]
+
+
+def stat_row(match):
+    """The STAT_FIELDS of a Match instance, shaped like a values() row"""
+    return {field: getattr(match, field) for field in STAT_FIELDS}
+
+
+def match_contributions(row):
+    """(competition_id, team_id) -> contribution vector for a played match row"""
+    contributions = {}
+    if not row or not row['has_played']:
+        return contributions
+    for alliance, station in SLOTS:
+        key = (row['competition_id'], row[f'{alliance}_team_{station}_id'])
+        vector = contributions.setdefault(key, [0] * len(TOTAL_FIELDS))
+        vector[0] += 1
+        vector[1] += row[f'{alliance}_{station}_fuel_scored']
+        vector[2] += row[f'{alliance}_{station}_auto_fuel']
+        vector[3] += CLIMB_POINTS.get(row[f'{alliance}_{station}_climb'], 0)
+    return contributions
+
+
+def combined_contributions(rows, contributions=match_contributions, width=len(TOTAL_FIELDS)):
+    """Summed contribution vectors of many match rows, e.g. every match written by one sync"""
+    combined = {}
+    for row in rows:
+        for key, vector in contributions(row).items():
+            combined[key] = [a + b for a, b in zip(combined.get(key, [0] * width), vector)]
+    return combined
+
+
+def previous_row(match):
+    """Stored STAT_FIELDS of a match about to be saved, or None for a new match"""
+    if match._state.adding or match.pk is None:
+        return None
+    return Match.objects.filter(pk=match.pk).values(*STAT_FIELDS).first()
+
+
+def contribution_deltas(old, new, width=len(TOTAL_FIELDS)):
+    deltas = {}
+    for key in old.keys() | new.keys():
+        before = old.get(key, [0] * width)
+        after = new.get(key, [0] * width)
+        delta = [a - b for a, b in zip(after, before)]
+        if any(delta):
+            deltas[key] = delta
+    return deltas
+
+
+def _average(total_field, matches_field, total_delta, matches_delta):
+    matches = F(matches_field) + matches_delta
+    return Case(
+        When(**{f'{matches_field}__gt': -matches_delta}, then=Cast(F(total_field) + total_delta, FloatField()) / matches),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def apply_deltas(deltas):
+    """Add contribution deltas to TeamInfo totals and averages with one UPDATE per team"""
+    by_competition = defaultdict(dict)
+    for (competition_id, team_id), delta in deltas.items():
+        by_competition[competition_id][team_id] = delta
+
+    for competition_id, team_deltas in by_competition.items():
+        with transaction.atomic():
+            version = bump_data_version(competition_id)
+            for team_id, delta in team_deltas.items():
+                changes = {field: F(field) + value for field, value in zip(TOTAL_FIELDS, delta)}
+                for average_field, total_field in AVERAGE_FIELDS.items():
+                    changes[average_field] = _average(
+                        total_field, 'matches_played', delta[TOTAL_FIELDS.index(total_field)], delta[0]
+                    )
+                TeamInfo.objects.filter(competition_id=competition_id, team_id=team_id).update(
+                    data_version=version, **changes
+                )
+
+
+def apply_match_change(old_row, new_row):
+    apply_deltas(contribution_deltas(match_contributions(old_row), match_contributions(new_row)))
+
+
+def load_competition_rows(competition_id):
+    """All played matches of a competition as STAT_FIELDS rows, in one query"""
+    return list(Match.objects.filter(competition_id=competition_id, has_played=True).values(*STAT_FIELDS))
+
+
+def compute_team_totals(rows):
+    """team_id -> summed contribution vector over match rows"""
+    totals = defaultdict(lambda: [0] * len(TOTAL_FIELDS))
+    for row in rows:
+        for (_, team_id), vector in match_contributions(row).items():
+            totals[team_id] = [a + b for a, b in zip(totals[team_id], vector)]
+    return dict(totals)
+
+
+def write_team_totals(competition_id, totals):
+    """Store totals and averages on every TeamInfo of a competition with one bulk_update"""
+    team_infos = list(TeamInfo.objects.filter(competition_id=competition_id))
+    for team_info in team_infos:
+        vector = totals.get(team_info.team_id, [0] * len(TOTAL_FIELDS))
+        for field, value in zip(TOTAL_FIELDS, vector):
+            setattr(team_info, field, value)
+        for average_field, total_field in AVERAGE_FIELDS.items():
+            total = getattr(team_info, total_field)
+            setattr(team_info, average_field, total / team_info.matches_played if team_info.matches_played else 0.0)
+
+    with transaction.atomic():
+        version = bump_data_version(competition_id)
+        for team_info in team_infos:
+            team_info.data_version = version
+        TeamInfo.objects.bulk_update(
+            team_infos, TOTAL_FIELDS + list(AVERAGE_FIELDS) + ['data_version'], batch_size=500
+        )
+    return team_infos
+
+
+def recompute_competition(competition_id):
+    """Full rebuild of the aggregates of one competition from its matches"""
+    return write_team_totals(competition_id, compute_team_totals(load_competition_rows(competition_id)))
@@ -0,0 +1,90 @@
+"""
+Distributions of team and match metrics for percentile colour coding.
+
+Observations are either TeamInfo values (one per team per competition it
+has played in) or per-slot Match values (one per team per played match),
+loaded with one query. Percentiles and histogram bins describe the observations; each
+team's value is the mean of its observations and its percentile rank is
+taken against the other teams' values, all with NumPy array operations.
+"""
+import numpy as np
+from ..models import Match, TeamInfo
+from ..participants import SLOTS
+from .aggregates import CLIMB_POINTS
+
+# Metric -> TeamInfo field
+TEAM_METRICS = {
+    'fuel_scored': 'avg_fuel_scored',
+    'auto_fuel': 'avg_auto_fuel',
+    'climb_points': 'avg_climb_points',
+    'accuracy': 'accuracy',
+    'ranking_points': 'ranking_points',
+}
+
+# Metric -> per-slot Match field suffix
+MATCH_METRICS = {
+    'fuel_scored': 'fuel_scored',
+    'auto_fuel': 'auto_fuel',
+    'teleop_fuel': 'teleop_fuel',
+    'climb_points': 'climb',
+}
+
+PERCENTILES = [5, 10, 25, 50, 75, 90, 95]
+
+
+def load_observations(metric, source, competition_id=None):
+    """(team numbers, values) arrays of every observation of a metric"""
+    if source == 'team':
+        # Teams yet to play have no averages, which would count as zeros
+        rows = TeamInfo.objects.filter(matches_played__gt=0)
+        if competition_id is not None:
+            rows = rows.filter(competition_id=competition_id)
+        rows = list(rows.values_list('team__number', TEAM_METRICS[metric]))
+        return (
+            np.array([row[0] for row in rows], dtype=np.int64),
+            np.array([row[1] or 0.0 for row in rows], dtype=float),
+        )
+
+    matches = Match.objects.filter(has_played=True)
+    if competition_id is not None:
+        matches = matches.filter(competition_id=competition_id)
+    suffix = MATCH_METRICS[metric]
+    rows = list(matches.values_list(
+        *[f'{alliance}_team_{station}__number' for alliance, station in SLOTS],
+        *[f'{alliance}_{station}_{suffix}' for alliance, station in SLOTS],
+    ))
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    table = np.array(rows, dtype=object)
+    values = table[:, 6:]
+    if suffix == 'climb':
+        values = np.vectorize(lambda level: CLIMB_POINTS.get(level, 0), otypes=[float])(values)
+    return table[:, :6].astype(np.int64).ravel(), values.astype(float).ravel()
+
+
+def describe(team_numbers, values, bins=10):
+    """Summary statistics, histogram and per-team percentile ranks of observations"""
+    if not len(values):
+        return {'count': 0, 'mean': None, 'std': None, 'percentiles': {}, 'histogram': {'edges': [], 'counts': []}, 'teams': []}
+
+    counts, edges = np.histogram(values, bins=bins)
+
+    teams, inverse = np.unique(team_numbers, return_inverse=True)
+    team_values = np.bincount(inverse, weights=values) / np.bincount(inverse)
+    ordered = np.sort(team_values)
+    # Mid-rank percentile: teams below plus half of the teams tied with the value
+    below = np.searchsorted(ordered, team_values, side='left')
+    at_or_below = np.searchsorted(ordered, team_values, side='right')
+    percentile_ranks = (below + at_or_below) / 2 / len(ordered) * 100
+
+    return {
+        'count': int(len(values)),
+        'mean': float(values.mean()),
+        'std': float(values.std()),
+        'percentiles': dict(zip(map(str, PERCENTILES), np.percentile(values, PERCENTILES).tolist())),
+        'histogram': {'edges': edges.tolist(), 'counts': counts.tolist()},
+        'teams': [
+            {'team_number': int(number), 'value': float(value), 'percentile_rank': float(rank)}
+            for number, value, rank in zip(teams, team_values, percentile_ranks)
+        ],
+    }
@@ -0,0 +1,105 @@
+"""
+Alliance contribution estimates (OPR, DPR, CCWM) for a competition.
+
+Every played qualification match gives two alliance rows. With A the
+(alliances x teams) 0/1 participation matrix, OPR solves A x = own alliance
+metric, DPR solves A x = opponent metric and CCWM solves A x = margin in
+the least-squares sense. All metrics and all three estimates are stacked as
+right-hand-side columns and solved in a single lstsq call.
+"""
+from dataclasses import dataclass
+import numpy as np
+from ..models import Match
+from ..participants import SLOTS
+from ..response_cache import cached_by_version
+from .aggregates import CLIMB_POINTS
+
+METRICS = ['fuel', 'auto_fuel', 'teleop_fuel', 'climb_points']
+
+TEAM_FIELDS = [f'{alliance}_team_{station}__number' for alliance, station in SLOTS]
+ALLIANCE_TOTAL_FIELDS = ['total_blue_fuels', 'total_red_fuels']
+SLOT_FIELDS = [
+    f'{alliance}_{station}_{stat}'
+    for stat in ('auto_fuel', 'teleop_fuel', 'climb')
+    for alliance, station in SLOTS
+]
+MATCH_FIELDS = TEAM_FIELDS + ALLIANCE_TOTAL_FIELDS + SLOT_FIELDS
+
+
+@dataclass
+class ContributionEstimates:
+    team_numbers: np.ndarray  # (teams,)
+    opr: np.ndarray           # (teams, metrics)
+    dpr: np.ndarray           # (teams, metrics)
+    ccwm: np.ndarray          # (teams, metrics)
+    residual_std: np.ndarray  # (metrics,) spread of alliance results around the OPR fit
+    matches: int
+
+    def team_index(self):
+        return {int(number): i for i, number in enumerate(self.team_numbers)}
+
+
+def alliance_data(rows):
+    """
+    Team numbers (matches x 6, blue then red) and alliance metrics
+    (matches x 2 x metrics) from played qualification match rows, given as
+    values() dicts carrying at least MATCH_FIELDS.
+    """
+    rows = [[row[field] for field in MATCH_FIELDS] for row in rows]
+    if not rows:
+        return np.zeros((0, 6), dtype=np.int64), np.zeros((0, 2, len(METRICS)))
+
+    columns = list(zip(*rows))
+    teams = np.array(columns[:6], dtype=np.int64).T
+    fuel = np.array(columns[6:8], dtype=float).T                      # (matches, 2)
+    auto = np.array(columns[8:14], dtype=float).T.reshape(-1, 2, 3)   # (matches, alliance, station)
+    teleop = np.array(columns[14:20], dtype=float).T.reshape(-1, 2, 3)
+    climb = np.vectorize(lambda level: CLIMB_POINTS.get(level, 0), otypes=[float])(
+        np.array(columns[20:26], dtype=object).T
+    ).reshape(-1, 2, 3)
+
+    metrics = np.stack([fuel, auto.sum(axis=2), teleop.sum(axis=2), climb.sum(axis=2)], axis=2)
+    return teams, metrics
+
+
+def load_alliance_data(competition_id):
+    """alliance_data of a competition's played qualification matches, in one query"""
+    return alliance_data(
+        Match.objects.filter(
+            competition_id=competition_id, has_played=True, match_type='qualification'
+        ).values(*MATCH_FIELDS)
+    )
+
+
+def solve_contributions(teams, metrics):
+    """Batched least-squares OPR/DPR/CCWM for every metric column"""
+    team_numbers, team_idx = np.unique(teams, return_inverse=True)
+    team_idx = team_idx.reshape(teams.shape)
+    num_matches, num_metrics = teams.shape[0], len(METRICS)
+
+    if num_matches == 0:
+        empty = np.zeros((len(team_numbers), num_metrics))
+        return ContributionEstimates(team_numbers, empty, empty, empty, np.zeros(num_metrics), 0)
+
+    # Alliance rows: blue alliances first, then red
+    participation = np.zeros((2 * num_matches, len(team_numbers)))
+    rows = np.repeat(np.arange(2 * num_matches), 3)
+    participation[rows, np.concatenate([team_idx[:, :3], team_idx[:, 3:]]).ravel()] = 1
+
+    own = np.concatenate([metrics[:, 0], metrics[:, 1]])
+    opponent = np.concatenate([metrics[:, 1], metrics[:, 0]])
+    rhs = np.hstack([own, opponent, own - opponent])
+
+    solution, *_ = np.linalg.lstsq(participation, rhs, rcond=None)
+    opr, dpr, ccwm = np.split(solution, 3, axis=1)
+    residual_std = np.sqrt(np.mean((participation @ opr - own) ** 2, axis=0))
+    return ContributionEstimates(team_numbers, opr, dpr, ccwm, residual_std, num_matches)
+
+
+def compute_contributions(competition_id):
+    return solve_contributions(*load_alliance_data(competition_id))
+
+
+def cached_contributions(competition):
+    """Estimates for the competition's current data version, computed at most once per version"""
+    return cached_by_version('opr', competition, lambda: compute_contributions(competition.pk))
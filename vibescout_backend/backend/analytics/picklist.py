@@ -0,0 +1,117 @@
+"""
+Pick-list engine for alliance selection.
+
+Each team is a vector of its per-match averages. An alliance's value sums,
+over metrics, weight * cap * (1 - exp(-total / cap)) of the alliance total:
+returns diminish as a metric approaches its cap, so a partner covering a
+metric the alliance is weak in (auto, teleop scoring, climb) is worth more
+than a third copy of the same strength. The cap of a metric is the total of
+the three best teams in it.
+
+The value is concave and zero for an empty alliance, so adding a team never
+adds more than that team's value on its own. The alliance search uses this
+as a bound: candidates are visited in order of their own value and a branch
+is cut as soon as the partial alliance plus the best remaining candidates
+cannot beat the K-th best alliance found so far.
+"""
+from dataclasses import dataclass
+import heapq
+import math
+from ..models import TeamInfo
+
+ALLIANCE_SIZE = 3
+
+METRICS = ['auto_fuel', 'teleop_fuel', 'climb_points']
+
+WEIGHTS = {'auto_fuel': 1.0, 'teleop_fuel': 1.0, 'climb_points': 1.0}
+
+
+def team_vector(avg_auto_fuel, avg_fuel_scored, avg_climb_points):
+    """Metric values in METRICS order from TeamInfo averages; fuel scored includes auto, so teleop is the rest"""
+    auto = avg_auto_fuel or 0.0
+    return (auto, max(0.0, (avg_fuel_scored or 0.0) - auto), avg_climb_points or 0.0)
+
+
+@dataclass
+class PickListModel:
+    team_numbers: list
+    vectors: list   # per team, a tuple of metric values in METRICS order
+    caps: tuple     # per metric
+    weights: tuple  # per metric
+
+    def value(self, totals):
+        return sum(
+            weight * cap * (1.0 - math.exp(-total / cap)) if cap > 0 else 0.0
+            for total, cap, weight in zip(totals, self.caps, self.weights)
+        )
+
+    def totals(self, teams):
+        return tuple(map(sum, zip(*(self.vectors[i] for i in teams)))) if teams else (0.0,) * len(self.caps)
+
+
+def load_model(competition_id, weights=None):
+    """Team vectors of a competition from TeamInfo averages, in one query"""
+    weights = {**WEIGHTS, **(weights or {})}
+    rows = list(
+        TeamInfo.objects.filter(competition_id=competition_id)
+        .order_by('team__number')
+        .values_list('team__number', 'avg_auto_fuel', 'avg_fuel_scored', 'avg_climb_points')
+    )
+    vectors = [team_vector(*row[1:]) for row in rows]
+    caps = tuple(
+        sum(sorted((vector[m] for vector in vectors), reverse=True)[:ALLIANCE_SIZE])
+        for m in range(len(METRICS))
+    )
+    return PickListModel(
+        team_numbers=[row[0] for row in rows],
+        vectors=vectors,
+        caps=caps,
+        weights=tuple(weights[metric] for metric in METRICS),
+    )
+
+
+def top_picks(model, alliance=(), k=10, excluded=()):
+    """The k candidates adding the most value to `alliance`, as (marginal value, team index)"""
+    unavailable = set(alliance) | set(excluded)
+    totals = model.totals(alliance)
+    base = model.value(totals)
+    return heapq.nlargest(k, (
+        (model.value([a + b for a, b in zip(totals, vector)]) - base, i)
+        for i, vector in enumerate(model.vectors)
+        if i not in unavailable
+    ))
+
+
+def top_alliances(model, k=10, required=(), excluded=()):
+    """The k most valuable full alliances containing `required`, as (value, team indexes)"""
+    required = tuple(required)
+    unavailable = set(required) | set(excluded)
+    standalone = [model.value(vector) for vector in model.vectors]
+    candidates = sorted(
+        (i for i in range(len(model.vectors)) if i not in unavailable),
+        key=lambda i: -standalone[i],
+    )
+    best = []  # min-heap of the k best (value, teams) so far
+
+    def search(start, chosen, totals, current):
+        remaining = ALLIANCE_SIZE - len(required) - len(chosen)
+        if remaining == 0:
+            entry = (current, required + chosen)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+            return
+        for position in range(start, len(candidates) - remaining + 1):
+            # The best remaining candidates bound any completion from here on, and the bound only
+            # shrinks with position, so once it cannot beat the k-th best no later position can either
+            bound = current + sum(standalone[i] for i in candidates[position:position + remaining])
+            if len(best) == k and bound <= best[0][0]:
+                break
+            team = candidates[position]
+            new_totals = tuple(a + b for a, b in zip(totals, model.vectors[team]))
+            search(position + 1, chosen + (team,), new_totals, model.value(new_totals))
+
+    totals = model.totals(required)
+    search(0, (), totals, model.value(totals))
+    return sorted(best, reverse=True)
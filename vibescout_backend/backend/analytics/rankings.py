@@ -0,0 +1,152 @@
+"""
+Materialized qualification rankings.
+
+Every played qualification match gives each team on the field one match,
+its alliance's fuel as a tiebreaker and a win, loss or tie; the alliance
+that scored more fuel wins 2 ranking points and a tie gives both alliances
+1. Saving a match applies only the change in these results to the Ranking
+rows and mirrors RP/W/L/T onto TeamInfo. Ranks are then reassigned from one
+query ordered by the database, writing only the rows whose position moved.
+"""
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import F
+from ..models import Ranking, TeamInfo
+from ..participants import SLOTS
+from ..versioning import bump_data_version
+from .aggregates import contribution_deltas, load_competition_rows
+
+WIN_RP = 2
+TIE_RP = 1
+
+# Result totals on Ranking, in the order of a result vector
+RESULT_FIELDS = ['matches_played', 'ranking_points', 'wins', 'losses', 'ties', 'total_fuel_scored']
+
+# Ranking fields mirrored onto TeamInfo
+TEAM_INFO_FIELDS = {'ranking_points': 'ranking_points', 'wins': 'win', 'losses': 'lose', 'ties': 'tie'}
+
+RANK_ORDER = ['-ranking_points', '-wins', '-total_fuel_scored', 'team__number']
+
+
+def match_results(row):
+    """(competition_id, team_id) -> result vector for a played qualification match row"""
+    results = {}
+    if not row or not row['has_played'] or row['match_type'] != 'qualification':
+        return results
+    fuel = {'blue': row['total_blue_fuels'], 'red': row['total_red_fuels']}
+    for alliance, station in SLOTS:
+        own = fuel[alliance]
+        other = fuel['red' if alliance == 'blue' else 'blue']
+        key = (row['competition_id'], row[f'{alliance}_team_{station}_id'])
+        vector = results.setdefault(key, [0] * len(RESULT_FIELDS))
+        vector[0] += 1
+        vector[1] += WIN_RP if own > other else TIE_RP if own == other else 0
+        vector[2] += own > other
+        vector[3] += own < other
+        vector[4] += own == other
+        vector[5] += own
+    return results
+
+
+def rerank(competition_id):
+    """Reassign rank numbers and average RP from the database ordering"""
+    rankings = Ranking.objects.filter(competition_id=competition_id).order_by(*RANK_ORDER).only(
+        'id', 'rank', 'matches_played', 'ranking_points', 'average_ranking_points'
+    )
+    changed = []
+    for rank, ranking in enumerate(rankings, 1):
+        average = ranking.ranking_points / ranking.matches_played if ranking.matches_played else 0.0
+        if ranking.rank != rank or ranking.average_ranking_points != average:
+            ranking.rank = rank
+            ranking.average_ranking_points = average
+            changed.append(ranking)
+    Ranking.objects.bulk_update(changed, ['rank', 'average_ranking_points'], batch_size=500)
+
+
+def apply_result_deltas(deltas):
+    """Add result deltas to Ranking and TeamInfo with one UPDATE each per team, then rerank"""
+    by_competition = defaultdict(dict)
+    for (competition_id, team_id), delta in deltas.items():
+        by_competition[competition_id][team_id] = delta
+
+    for competition_id, team_deltas in by_competition.items():
+        with transaction.atomic():
+            version = bump_data_version(competition_id)
+            # A delta that only subtracts removes results from an existing row and never needs a new one
+            Ranking.objects.bulk_create(
+                [
+                    Ranking(competition_id=competition_id, team_id=team_id)
+                    for team_id, delta in team_deltas.items() if any(value > 0 for value in delta)
+                ],
+                ignore_conflicts=True,
+            )
+            for team_id, delta in team_deltas.items():
+                changes = dict(zip(RESULT_FIELDS, delta))
+                Ranking.objects.filter(competition_id=competition_id, team_id=team_id).update(
+                    **{field: F(field) + value for field, value in changes.items()}
+                )
+                TeamInfo.objects.filter(competition_id=competition_id, team_id=team_id).update(
+                    data_version=version,
+                    **{field: F(field) + changes[source] for source, field in TEAM_INFO_FIELDS.items()},
+                )
+            rerank(competition_id)
+
+
+def apply_match_result_change(old_row, new_row):
+    apply_result_deltas(
+        contribution_deltas(match_results(old_row), match_results(new_row), width=len(RESULT_FIELDS))
+    )
+
+
+def ensure_ranking(competition_id, team_id):
+    """Give a team a (last place) ranking as soon as it is registered at a competition"""
+    _, created = Ranking.objects.get_or_create(competition_id=competition_id, team_id=team_id)
+    if created:
+        rerank(competition_id)
+
+
+def remove_ranking(competition_id, team_id):
+    Ranking.objects.filter(competition_id=competition_id, team_id=team_id).delete()
+    rerank(competition_id)
+
+
+def compute_rankings(rows):
+    """team_id -> summed result vector over match rows"""
+    totals = defaultdict(lambda: [0] * len(RESULT_FIELDS))
+    for row in rows:
+        for (_, team_id), vector in match_results(row).items():
+            totals[team_id] = [a + b for a, b in zip(totals[team_id], vector)]
+    return dict(totals)
+
+
+def write_rankings(competition_id, totals):
+    """Store result totals on the Ranking rows and TeamInfo of a competition with bulk writes, then rerank"""
+    team_infos = list(TeamInfo.objects.filter(competition_id=competition_id))
+    team_ids = set(totals) | {team_info.team_id for team_info in team_infos}
+
+    with transaction.atomic():
+        version = bump_data_version(competition_id)
+        Ranking.objects.filter(competition_id=competition_id).exclude(team_id__in=team_ids).delete()
+        Ranking.objects.bulk_create(
+            [Ranking(competition_id=competition_id, team_id=team_id) for team_id in team_ids],
+            ignore_conflicts=True,
+        )
+        rankings = list(Ranking.objects.filter(competition_id=competition_id))
+        for ranking in rankings:
+            for field, value in zip(RESULT_FIELDS, totals.get(ranking.team_id, [0] * len(RESULT_FIELDS))):
+                setattr(ranking, field, value)
+        Ranking.objects.bulk_update(rankings, RESULT_FIELDS, batch_size=500)
+
+        for team_info in team_infos:
+            vector = dict(zip(RESULT_FIELDS, totals.get(team_info.team_id, [0] * len(RESULT_FIELDS))))
+            for source, field in TEAM_INFO_FIELDS.items():
+                setattr(team_info, field, vector[source])
+            team_info.data_version = version
+        TeamInfo.objects.bulk_update(team_infos, list(TEAM_INFO_FIELDS.values()) + ['data_version'], batch_size=500)
+
+        rerank(competition_id)
+
+
+def recompute_rankings(competition_id):
+    """Full rebuild of a competition's rankings and TeamInfo RP/W/L/T from its matches"""
+    write_rankings(competition_id, compute_rankings(load_competition_rows(competition_id)))
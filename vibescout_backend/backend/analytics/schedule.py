@@ -0,0 +1,83 @@
+"""
+Team-vs-team schedule matrices and strength of schedule.
+
+With B and R the (matches x teams) 0/1 matrices of blue and red
+participation in qualification matches, B'B + R'R counts how often two
+teams share an alliance (its diagonal is each team's match count) and
+B'R + R'B how often they face each other. Both come from one query and two
+matrix products. Strength of schedule weights team strength (fuel OPR, the
+field average for teams without results) by those counts.
+"""
+from dataclasses import dataclass
+import numpy as np
+from ..models import Match
+from ..participants import SLOTS
+from ..response_cache import cached_by_version
+from .opr import METRICS, cached_contributions
+
+TEAM_FIELDS = [f'{alliance}_team_{station}__number' for alliance, station in SLOTS]
+
+
+@dataclass
+class ScheduleMatrices:
+    team_numbers: np.ndarray  # (teams,)
+    partners: np.ndarray      # (teams, teams) matches together on an alliance, diagonal = matches
+    opponents: np.ndarray     # (teams, teams) matches on opposite alliances
+
+
+def build_matrices(competition_id):
+    schedule = np.array(
+        Match.objects.filter(competition_id=competition_id, match_type='qualification').values_list(*TEAM_FIELDS),
+        dtype=np.int64,
+    ).reshape(-1, 6)
+    team_numbers, index = np.unique(schedule, return_inverse=True)
+    index = index.reshape(-1, 6)
+
+    rows = np.arange(len(schedule))[:, None]
+    blue = np.zeros((len(schedule), len(team_numbers)), dtype=np.int64)
+    red = np.zeros_like(blue)
+    # np.add.at keeps a team listed twice in one alliance from being counted once
+    np.add.at(blue, (rows, index[:, :3]), 1)
+    np.add.at(red, (rows, index[:, 3:]), 1)
+
+    return ScheduleMatrices(
+        team_numbers=team_numbers,
+        partners=blue.T @ blue + red.T @ red,
+        opponents=blue.T @ red + red.T @ blue,
+    )
+
+
+def cached_matrices(competition):
+    return cached_by_version('schedule-matrices', competition, lambda: build_matrices(competition.pk))
+
+
+def strength_of_schedule(matrices, estimates):
+    """Per-team mean partner and opponent strength, weighted by how often they meet"""
+    fuel = estimates.opr[:, METRICS.index('fuel')]
+    lookup = estimates.team_index()
+    fallback = fuel.mean() if len(fuel) else 0.0
+    strength = np.array([
+        fuel[lookup[number]] if number in lookup else fallback
+        for number in matrices.team_numbers.tolist()
+    ])
+
+    partners = matrices.partners - np.diag(np.diag(matrices.partners))
+    partner_slots = partners.sum(axis=1)
+    opponent_slots = matrices.opponents.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        partner_strength = np.where(partner_slots > 0, partners @ strength / partner_slots, 0.0)
+        opponent_strength = np.where(opponent_slots > 0, matrices.opponents @ strength / opponent_slots, 0.0)
+
+    return [
+        {
+            'team_number': int(number),
+            'matches': int(matrices.partners[i, i]),
+            'strength': float(strength[i]),
+            'mean_partner_strength': float(partner_strength[i]),
+            'mean_opponent_strength': float(opponent_strength[i]),
+            'strength_of_schedule': float(opponent_strength[i] - partner_strength[i]),
+            'max_partner_repeats': int(partners[i].max(initial=0)),
+            'max_opponent_repeats': int(matrices.opponents[i].max(initial=0)),
+        }
+        for i, number in enumerate(matrices.team_numbers)
+    ]
@@ -0,0 +1,131 @@
+"""
+Shooting cycle summaries derived from ShotTiming intervals.
+
+A team's intervals in a match are read in start order (served by the
+(match, team, start_shot_time) index) and merged in one pass; each merged
+interval is a cycle. Cycle time is measured start to start and idle gaps
+are the pauses between cycles. Summaries are refreshed per (match, team)
+pair whenever that pair's intervals change, so the cost of an update is
+proportional to one team's shots in one match rather than the whole table.
+"""
+from statistics import median
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from ..models import Match, ShotTiming, ShotCycleSummary
+
+SUMMARY_FIELDS = [
+    'shots', 'cycles', 'shooting_time', 'active_time', 'duty_cycle', 'cycle_time_total',
+    'mean_cycle_time', 'median_cycle_time', 'idle_time', 'max_idle_gap',
+]
+
+
+def merge_intervals(intervals):
+    """Merge (start, end) intervals already sorted by start"""
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def summarize_intervals(intervals):
+    """Cycle metrics for one team in one match from its (start, end) intervals sorted by start"""
+    cycles = merge_intervals(intervals)
+    starts = [start for start, _ in cycles]
+    cycle_times = [b - a for a, b in zip(starts, starts[1:])]
+    gaps = [start - previous_end for (_, previous_end), (start, _) in zip(cycles, cycles[1:])]
+    shooting_time = sum(end - start for start, end in cycles)
+    active_time = cycles[-1][1] - cycles[0][0]
+    return {
+        'shots': len(intervals),
+        'cycles': len(cycles),
+        'shooting_time': shooting_time,
+        'active_time': active_time,
+        'duty_cycle': shooting_time / active_time if active_time > 0 else 1.0,
+        'cycle_time_total': starts[-1] - starts[0],
+        'mean_cycle_time': sum(cycle_times) / len(cycle_times) if cycle_times else None,
+        'median_cycle_time': median(cycle_times) if cycle_times else None,
+        'idle_time': sum(gaps),
+        'max_idle_gap': max(gaps, default=0.0),
+    }
+
+
+def refresh_summaries(pairs):
+    """
+    Rebuild the summaries of (match_id, team_id) pairs from their intervals.
+    Called from the ShotTiming signals and by bulk writers, which bypass them.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return
+    match_ids = {match_id for match_id, _ in pairs}
+    team_ids = {team_id for _, team_id in pairs}
+
+    intervals = {}
+    for match_id, team_id, start, end in (
+        ShotTiming.objects.filter(match_id__in=match_ids, team_id__in=team_ids)
+        .order_by('match_id', 'team_id', 'start_shot_time')
+        .values_list('match_id', 'team_id', 'start_shot_time', 'end_shot_time')
+    ):
+        if (match_id, team_id) in pairs:
+            intervals.setdefault((match_id, team_id), []).append((start, end))
+    competitions = dict(Match.objects.filter(pk__in=match_ids).values_list('pk', 'competition_id'))
+
+    stale = Q()
+    for match_id in match_ids:
+        stale |= Q(match_id=match_id, team_id__in=[team_id for pair_match, team_id in pairs if pair_match == match_id])
+
+    with transaction.atomic():
+        ShotCycleSummary.objects.filter(stale).delete()
+        ShotCycleSummary.objects.bulk_create([
+            ShotCycleSummary(
+                match_id=match_id,
+                team_id=team_id,
+                competition_id=competitions[match_id],
+                **summarize_intervals(rows),
+            )
+            for (match_id, team_id), rows in intervals.items()
+            if match_id in competitions
+        ])
+
+
+def team_rollups(competition_id):
+    """
+    Per-team cycle metrics over all of a competition's matches in one
+    aggregate query. Ratios are taken over the season sums, so matches with
+    more cycles carry more weight.
+    """
+    rows = (
+        ShotCycleSummary.objects.filter(competition_id=competition_id)
+        .values('team__number')
+        .annotate(
+            matches=Count('id'),
+            shots=Sum('shots'),
+            cycles=Sum('cycles'),
+            shooting_time=Sum('shooting_time'),
+            active_time=Sum('active_time'),
+            cycle_time_total=Sum('cycle_time_total'),
+            idle_time=Sum('idle_time'),
+            max_idle_gap=Max('max_idle_gap'),
+        )
+        .order_by('team__number')
+    )
+    rollups = []
+    for row in rows:
+        # Each match with n cycles contributes n - 1 start-to-start intervals and gaps
+        intervals = row['cycles'] - row['matches']
+        rollups.append({
+            'team_number': row['team__number'],
+            'matches': row['matches'],
+            'shots': row['shots'],
+            'cycles': row['cycles'],
+            'cycles_per_match': row['cycles'] / row['matches'],
+            'duty_cycle': row['shooting_time'] / row['active_time'] if row['active_time'] > 0 else 1.0,
+            'mean_cycle_time': row['cycle_time_total'] / intervals if intervals else None,
+            'mean_idle_gap': row['idle_time'] / intervals if intervals else None,
+            'max_idle_gap': row['max_idle_gap'],
+        })
+    return rollups
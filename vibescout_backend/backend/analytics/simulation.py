@@ -0,0 +1,195 @@
+"""
+Monte Carlo projection of final qualification rankings.
+
+The remaining qualification matches are played out many times with the
+results model from generate_competition: an alliance's fuel is its expected
+fuel (sum of its teams' fuel OPR) times uniform +/-15% noise, the higher fuel
+wins 2 RP and a tie gives both alliances 1 RP. Teams are ranked like the
+Ranking table (rankings.RANK_ORDER): ranking points, then wins, then
+alliance fuel, then team number.
+
+Simulations run in chunks of vectorized NumPy on one process pool shared by
+every request of the server process, sized by settings.PROJECTION_WORKERS.
+The kernel only needs NumPy, so this module imports Django lazily and stays
+importable in pool workers under any multiprocessing start method.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import threading
+import numpy as np
+
+NOISE = 0.15
+WIN_RP = 2
+TIE_RP = 1
+CHUNK_SIZE = 2000  # simulations per kernel call, bounds peak memory at (chunk x matches) floats
+
+
+@dataclass
+class ProjectionInputs:
+    team_numbers: np.ndarray  # (teams,)
+    ranking_points: np.ndarray  # (teams,) current RP
+    wins: np.ndarray          # (teams,) current wins
+    fuel: np.ndarray          # (teams,) current alliance fuel tiebreaker
+    strength: np.ndarray      # (teams,) expected fuel contribution
+    schedule: np.ndarray      # (matches, 6) team indexes, blue then red
+
+
+@dataclass
+class RankProjection:
+    team_numbers: np.ndarray
+    ranking_points: np.ndarray
+    rank_counts: np.ndarray   # (teams, teams) simulations finishing at each rank
+    rp_gain_counts: np.ndarray  # (teams, max gain + 1) simulations gaining each number of RP
+    simulations: int
+    remaining_matches: int
+
+
+def load_projection_inputs(competition_id):
+    """Current standings, fuel OPR and the unplayed qualification schedule, in three queries"""
+    from ..models import Match, Ranking
+    from ..participants import SLOTS
+    from .opr import METRICS, compute_contributions
+
+    standings = list(
+        Ranking.objects.filter(competition_id=competition_id)
+        .values_list('team__number', 'ranking_points', 'wins', 'total_fuel_scored')
+    )
+    schedule = list(
+        Match.objects.filter(competition_id=competition_id, match_type='qualification', has_played=False)
+        .values_list(*[f'{alliance}_team_{station}__number' for alliance, station in SLOTS])
+    )
+
+    team_numbers = [row[0] for row in standings]
+    known = set(team_numbers)
+    for row in schedule:
+        for number in row:
+            if number not in known:
+                known.add(number)
+                team_numbers.append(number)
+                standings.append((number, 0.0, 0, 0))
+    index = {number: i for i, number in enumerate(team_numbers)}
+
+    estimates = compute_contributions(competition_id)
+    fuel = estimates.opr[:, METRICS.index('fuel')]
+    fallback = fuel.mean() if len(fuel) else 0.0
+    opr = dict(zip(estimates.team_numbers.tolist(), fuel.tolist()))
+
+    return ProjectionInputs(
+        team_numbers=np.array(team_numbers, dtype=np.int64),
+        ranking_points=np.array([row[1] for row in standings], dtype=float),
+        wins=np.array([row[2] for row in standings], dtype=np.int64),
+        fuel=np.array([row[3] for row in standings], dtype=float),
+        strength=np.array([opr.get(number, fallback) for number in team_numbers], dtype=float),
+        schedule=np.array([[index[number] for number in row] for row in schedule], dtype=np.int64).reshape(-1, 6),
+    )
+
+
+def simulate_chunk(inputs, runs, seed):
+    """Play the schedule `runs` times; returns (rank counts, RP gain counts) for the chunk"""
+    rng = np.random.default_rng(seed)
+    teams = len(inputs.team_numbers)
+    matches = len(inputs.schedule)
+
+    # (matches, teams) incidence matrices turn per-match outcomes into per-team totals
+    blue = np.zeros((matches, teams))
+    red = np.zeros((matches, teams))
+    rows = np.arange(matches)[:, None]
+    blue[rows, inputs.schedule[:, :3]] = 1
+    red[rows, inputs.schedule[:, 3:]] = 1
+
+    expected = inputs.strength[inputs.schedule].reshape(matches, 2, 3).sum(axis=2)  # (matches, 2)
+    fuel = expected * rng.uniform(1 - NOISE, 1 + NOISE, size=(runs, matches, 2))
+    blue_win = (fuel[:, :, 0] > fuel[:, :, 1]).astype(float)
+    red_win = (fuel[:, :, 0] < fuel[:, :, 1]).astype(float)
+    tie = 1.0 - blue_win - red_win
+
+    wins = blue_win @ blue + red_win @ red  # (runs, teams)
+    gain = WIN_RP * wins + TIE_RP * (tie @ (blue + red))
+    final_rp = inputs.ranking_points + gain
+    final_wins = inputs.wins + wins
+    final_fuel = inputs.fuel + fuel[:, :, 0] @ blue + fuel[:, :, 1] @ red
+
+    # lexsort keys run from least to most significant, mirroring rankings.RANK_ORDER
+    numbers = np.broadcast_to(inputs.team_numbers, (runs, teams))
+    order = np.lexsort((numbers, -final_fuel, -final_wins, -final_rp), axis=-1)
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.broadcast_to(np.arange(teams), order.shape), axis=1)
+
+    team_ids = np.arange(teams)
+    rank_counts = np.bincount((team_ids * teams + ranks).ravel(), minlength=teams * teams)
+    max_gain = WIN_RP * matches
+    gain_counts = np.bincount(
+        (team_ids * (max_gain + 1) + gain.round().astype(np.int64)).ravel(),
+        minlength=teams * (max_gain + 1),
+    )
+    return rank_counts.reshape(teams, teams), gain_counts.reshape(teams, max_gain + 1)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def shared_pool():
+    """The process pool of this server process, created on first use with settings.PROJECTION_WORKERS"""
+    global _pool
+    from django.conf import settings
+
+    if settings.PROJECTION_WORKERS <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=settings.PROJECTION_WORKERS)
+        return _pool
+
+
+def project_rankings(inputs, runs=10000, seed=None):
+    """Split `runs` simulations into chunks and sum their histograms, on the shared pool when there are several"""
+    chunks = [CHUNK_SIZE] * (runs // CHUNK_SIZE) + ([runs % CHUNK_SIZE] if runs % CHUNK_SIZE else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+
+    # A single chunk is cheaper in-process than a round trip to a worker
+    pool = shared_pool() if len(chunks) > 1 else None
+    if pool:
+        results = list(pool.map(simulate_chunk, [inputs] * len(chunks), chunks, seeds))
+    else:
+        results = [simulate_chunk(inputs, size, chunk_seed) for size, chunk_seed in zip(chunks, seeds)]
+
+    return RankProjection(
+        team_numbers=inputs.team_numbers,
+        ranking_points=inputs.ranking_points,
+        rank_counts=sum(result[0] for result in results),
+        rp_gain_counts=sum(result[1] for result in results),
+        simulations=runs,
+        remaining_matches=len(inputs.schedule),
+    )
+
+
+def projection_payload(projection):
+    """Per-team rank and RP distributions, ordered by expected rank"""
+    rank_probabilities = projection.rank_counts / projection.simulations
+    gain_probabilities = projection.rp_gain_counts / projection.simulations
+    expected_rank = rank_probabilities @ np.arange(1, len(projection.team_numbers) + 1)
+    expected_gain = gain_probabilities @ np.arange(gain_probabilities.shape[1])
+
+    teams = [
+        {
+            'team_number': int(number),
+            'current_ranking_points': float(projection.ranking_points[i]),
+            'expected_ranking_points': float(projection.ranking_points[i] + expected_gain[i]),
+            'expected_rank': float(expected_rank[i]),
+            'rank_probabilities': rank_probabilities[i].tolist(),
+            'ranking_point_distribution': [
+                {
+                    'ranking_points': float(projection.ranking_points[i] + gain),
+                    'probability': float(gain_probabilities[i, gain]),
+                }
+                for gain in np.flatnonzero(gain_probabilities[i])
+            ],
+        }
+        for i, number in enumerate(projection.team_numbers)
+    ]
+    return {
+        'simulations': projection.simulations,
+        'remaining_matches': projection.remaining_matches,
+        'teams': sorted(teams, key=lambda team: team['expected_rank']),
+    }
@@ -1,15 +1,42 @@
-from ninja import NinjaAPI
-from typing import List
+from ninja import NinjaAPI, Query
+from ninja.errors import HttpError
+from typing import List, Literal, Union
+from django.http import HttpResponse
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from .models import Team, Competition, TeamInfo, Match, ShotTiming
+from .models import Team, Competition, TeamInfo, Match, ShotTiming, Ranking, ShotCycleSummary
 from .schemas import (
     TeamSchema, CompetitionSchema,
     TeamInfoSchema, 
-    PrescouttingUpdateSchema, MatchSchema,
-    ShotTimingSchema, ShotTimingCreateSchema
+    PrescouttingUpdateSchema, PrescoutingBulkItemSchema, PrescoutingBulkResultSchema,
+    MatchSchema,
+    ShotTimingSchema, ShotTimingCreateSchema,
+    ShotTimingBatchItemSchema, ShotTimingBatchResultSchema,
+    CompetitionSyncSchema, CompactMatchListSchema,
+    ContributionsSchema, MatchPredictionSchema, RankProjectionSchema,
+    ShotCycleSummarySchema, TeamShotCycleSchema, RankingSchema, TeamProfileSchema,
+    PickListSchema, ScheduleAnalysisSchema, MetricDistributionSchema
+)
+from .analytics.distributions import TEAM_METRICS, MATCH_METRICS, load_observations, describe
+from .analytics.opr import METRICS, cached_contributions
+from .analytics import picklist
+from .analytics.predictions import load_unplayed, predict_matches
+from .analytics.schedule import cached_matrices, strength_of_schedule
+from .analytics.shot_cycles import refresh_summaries, team_rollups
+from .analytics.simulation import load_projection_inputs, project_rankings, projection_payload
+from .api_async import router as async_router
+from .compact import compact_matches
+from .profiles import team_profiles, profile_versions
+from .queries import competition_matches, team_matches
+from .versioning import conditional_response, bump_data_version, stamp_bulk_data_version
+from .response_cache import (
+    COMPETITIONS_SCOPE, competition_scope, team_scope,
+    cached_json, cached_by_version, serialize
 )
 
 api = NinjaAPI()
+api.add_router("/async", async_router)
 
 
 @api.get("/health")
@@ -17,8 +44,11 @@ def health(request):
     return {"status": "healthy"}
 
 @api.get("/competitions", response=List[CompetitionSchema])
-def list_competitions(request):
-    return Competition.objects.all()
+def list_competitions(request, response: HttpResponse):
+    return cached_json(
+        response, ('competitions',), [COMPETITIONS_SCOPE],
+        lambda: serialize(List[CompetitionSchema], Competition.objects.all()),
+    )
 
 
 @api.get("/competitions/{code}", response=CompetitionSchema)
@@ -27,13 +57,23 @@ def get_competition(request, code: str):
 
 
 @api.get("/team-info", response=List[TeamInfoSchema])
-def list_team_info(request, competition_code: str, team_number: int = None):
+def list_team_info(request, response: HttpResponse, competition_code: str, team_number: int = None):
     competition = get_object_or_404(Competition, code=competition_code)
-    queryset = TeamInfo.objects.select_related('team', 'competition').filter(competition=competition)
-    if team_number:
-        team = get_object_or_404(Team, number=team_number)
-        queryset = queryset.filter(team=team)
-    return queryset
+    not_modified = conditional_response(request, response, competition)
+    if not_modified:
+        return not_modified
+
+    def build():
+        queryset = TeamInfo.objects.select_related('team', 'competition').filter(competition=competition)
+        if team_number:
+            team = get_object_or_404(Team, number=team_number)
+            queryset = queryset.filter(team=team)
+        return serialize(List[TeamInfoSchema], queryset)
+
+    return cached_json(
+        response, ('team-info', competition.pk, competition.data_version, team_number),
+        [competition_scope(competition.pk)], build,
+    )
 
 
 @api.patch("/team-info/prescouting", response=TeamInfoSchema)
@@ -41,43 +81,372 @@ def update_prescouting(request, competition_code: str, team_number: int, payload
     competition = get_object_or_404(Competition, code=competition_code)
     team = get_object_or_404(Team, number=team_number)
     team_info = get_object_or_404(TeamInfo, team=team, competition=competition)
-    for attr, value in payload.dict(exclude_unset=True).items():
+    changes = payload.dict(exclude_unset=True)
+    for attr, value in changes.items():
         setattr(team_info, attr, value)
-    team_info.save()
+    # Only write the prescouting columns so running match totals are never overwritten
+    team_info.save(update_fields=list(changes))
     return team_info
 
 
+@api.patch("/team-info/prescouting/bulk", response=PrescoutingBulkResultSchema)
+def bulk_update_prescouting(request, competition_code: str, payload: List[PrescoutingBulkItemSchema]):
+    """
+    Apply prescouting updates for many teams of one competition. Teams are
+    resolved in one query and all valid items are written with a single
+    bulk_update of the touched fields; invalid items are reported per index.
+    """
+    competition = get_object_or_404(Competition, code=competition_code)
+    team_infos = {
+        team_info.team.number: team_info
+        for team_info in TeamInfo.objects.select_related('team', 'competition').filter(
+            competition=competition,
+            team__number__in={item.team_number for item in payload},
+        )
+    }
+
+    errors = []
+    touched = {}
+    touched_fields = set()
+    for index, item in enumerate(payload):
+        team_info = team_infos.get(item.team_number)
+        if team_info is None:
+            errors.append({
+                'index': index,
+                'team_number': item.team_number,
+                'detail': f'Team {item.team_number} is not registered for {competition_code}',
+            })
+            continue
+
+        changes = item.dict(exclude_unset=True, exclude={'team_number'})
+        try:
+            changes = {
+                attr: TeamInfo._meta.get_field(attr).clean(value, team_info)
+                for attr, value in changes.items()
+            }
+        except ValidationError as e:
+            errors.append({'index': index, 'team_number': item.team_number, 'detail': '; '.join(e.messages)})
+            continue
+
+        for attr, value in changes.items():
+            setattr(team_info, attr, value)
+        touched[team_info.pk] = team_info
+        touched_fields.update(changes)
+
+    if touched and touched_fields:
+        with transaction.atomic():
+            TeamInfo.objects.bulk_update(touched.values(), sorted(touched_fields))
+            stamp_bulk_data_version(TeamInfo, touched.keys(), competition.pk)
+
+    return {'updated': list(touched.values()), 'errors': errors}
+
+
 @api.get("/teams/{team_number}/competitions", response=List[CompetitionSchema])
-def get_team_competitions(request, team_number: int):
+def get_team_competitions(request, response: HttpResponse, team_number: int):
+    team = get_object_or_404(Team, number=team_number)
+    return cached_json(
+        response, ('team-competitions', team.pk), [COMPETITIONS_SCOPE, team_scope(team.pk)],
+        lambda: serialize(List[CompetitionSchema], Competition.objects.filter(results__team=team).distinct()),
+    )
+
+
+@api.get("/teams/profiles", response=List[TeamProfileSchema])
+def get_team_profiles(request, response: HttpResponse, team_numbers: List[int] = Query(...)):
+    """Season profiles of many teams at once, e.g. every team at an upcoming event"""
+    teams = list(Team.objects.filter(number__in=team_numbers).order_by('number'))
+    versions = profile_versions(teams)
+    return cached_json(
+        response, ('team-profiles', *(team.pk for team in teams), *versions),
+        [*(team_scope(team.pk) for team in teams), *(competition_scope(pk) for pk, _ in versions)],
+        lambda: serialize(List[TeamProfileSchema], team_profiles(teams)),
+    )
+
+
+@api.get("/teams/{team_number}/profile", response=TeamProfileSchema)
+def get_team_profile(request, response: HttpResponse, team_number: int):
+    """Every TeamInfo row of a team plus season aggregates: weighted averages, W-L-T and best event"""
     team = get_object_or_404(Team, number=team_number)
-    return Competition.objects.filter(results__team=team).distinct()
+    versions = profile_versions([team])
+    return cached_json(
+        response, ('team-profile', team.pk, *versions),
+        [team_scope(team.pk), *(competition_scope(pk) for pk, _ in versions)],
+        lambda: serialize(TeamProfileSchema, team_profiles([team])[0]),
+    )
+
+
+@api.get("/metrics/distribution", response=MetricDistributionSchema)
+def get_metric_distribution(
+    request, response: HttpResponse,
+    metric: Literal['fuel_scored', 'auto_fuel', 'teleop_fuel', 'climb_points', 'accuracy', 'ranking_points'],
+    source: Literal['team', 'match'] = 'team', competition_code: str = None, bins: int = Query(10, ge=1, le=100),
+):
+    """
+    Percentiles, histogram and per-team percentile rank of a metric over a
+    competition, or the whole season when no competition is given. The team
+    source uses TeamInfo values and the match source per-match values.
+    """
+    if metric not in (TEAM_METRICS if source == 'team' else MATCH_METRICS):
+        raise HttpError(400, f"{metric} is not available from {source} data")
+    competition = None
+    if competition_code:
+        competition = get_object_or_404(Competition, code=competition_code)
+        versions = [(competition.pk, competition.data_version)]
+    else:
+        versions = list(Competition.objects.order_by('pk').values_list('pk', 'data_version'))
+
+    def build():
+        team_numbers, values = load_observations(metric, source, competition.pk if competition else None)
+        return serialize(MetricDistributionSchema, {
+            'metric': metric, 'source': source, **describe(team_numbers, values, bins),
+        })
+
+    return cached_json(
+        response, ('metric-distribution', metric, source, bins, competition_code, *versions),
+        [COMPETITIONS_SCOPE, *(competition_scope(pk) for pk, _ in versions)], build,
+    )
+
+
+@api.get("/teams/{team_number}/matches", response=List[MatchSchema])
+def get_team_matches(request, response: HttpResponse, team_number: int, competition_code: str = None):
+    team = get_object_or_404(Team, number=team_number)
+    competition = None
+    if competition_code:
+        competition = get_object_or_404(Competition, code=competition_code)
+        versions = [(competition.pk, competition.data_version)]
+    else:
+        versions = list(
+            Competition.objects.filter(participants__team=team).distinct().values_list('pk', 'data_version')
+        )
+    return cached_json(
+        response, ('team-matches', team.pk, competition_code, *versions),
+        [team_scope(team.pk), *(competition_scope(pk) for pk, _ in versions)],
+        lambda: serialize(List[MatchSchema], team_matches(team, competition)),
+    )
 
 
 @api.get("/competitions/{code}/teams", response=List[TeamSchema])
-def get_competition_teams(request, code: str):
+def get_competition_teams(request, response: HttpResponse, code: str):
     competition = get_object_or_404(Competition, code=code)
-    return Team.objects.filter(results__competition=competition).distinct().order_by('number')
+    return cached_json(
+        response, ('competition-teams', competition.pk, competition.data_version),
+        [competition_scope(competition.pk)],
+        lambda: serialize(
+            List[TeamSchema],
+            Team.objects.filter(results__competition=competition).distinct().order_by('number'),
+        ),
+    )
 
 
-@api.get("/competitions/{code}/matches", response=List[MatchSchema])
-def get_competition_matches_by_code(request, code: str):
-    from django.db.models import Case, When, IntegerField
-    
+@api.get("/competitions/{code}/matches", response=Union[List[MatchSchema], CompactMatchListSchema])
+def get_competition_matches_by_code(request, response: HttpResponse, code: str, format: Literal['full', 'compact'] = 'full'):
     competition = get_object_or_404(Competition, code=code)
-    
-    match_type_order = Case(
-        When(match_type='qualification', then=1),
-        When(match_type='quarterfinal', then=2),
-        When(match_type='semifinal', then=3),
-        When(match_type='final', then=4),
-        default=5,
-        output_field=IntegerField()
+    not_modified = conditional_response(request, response, competition)
+    if not_modified:
+        return not_modified
+
+    def build():
+        if format == 'compact':
+            return serialize(CompactMatchListSchema, compact_matches(competition, competition_matches(competition)))
+        return serialize(List[MatchSchema], competition_matches(competition))
+
+    return cached_json(
+        response, ('matches', competition.pk, competition.data_version, format),
+        [competition_scope(competition.pk)], build,
     )
-    
-    return Match.objects.select_related(
-        'competition', 'blue_team_1', 'blue_team_2', 'blue_team_3',
-        'red_team_1', 'red_team_2', 'red_team_3'
-    ).filter(competition=competition).order_by(match_type_order, 'match_number')
+
+
+@api.get("/competitions/{code}/sync", response=CompetitionSyncSchema)
+def sync_competition(request, response: HttpResponse, code: str, since: int = None):
+    """
+    Delta sync: rows created or updated after the client's version `since`,
+    tombstones for rows deleted since then, and the new high-water mark.
+    Omitting `since` returns the full data set.
+    """
+    competition = get_object_or_404(Competition, code=code)
+    not_modified = conditional_response(request, response, competition)
+    if not_modified:
+        return not_modified
+
+    # Read the high-water mark first; rows stamped after it are simply sent again next time
+    version = competition.data_version
+    matches = competition_matches(competition)
+    team_info = TeamInfo.objects.select_related('team', 'competition').filter(competition=competition)
+    shot_timings = ShotTiming.objects.select_related('team', 'match').filter(match__competition=competition)
+    deleted = competition.deleted_records.none()
+    if since is not None:
+        matches = matches.filter(data_version__gt=since)
+        team_info = team_info.filter(data_version__gt=since)
+        shot_timings = shot_timings.filter(data_version__gt=since)
+        deleted = competition.deleted_records.filter(data_version__gt=since)
+
+    return {
+        'version': version,
+        'matches': matches,
+        'team_info': team_info,
+        'shot_timings': shot_timings,
+        'deleted': deleted,
+    }
+
+@api.get("/competitions/{code}/rankings", response=List[RankingSchema])
+def get_competition_rankings(request, response: HttpResponse, code: str):
+    """Qualification rankings in rank order, read from the materialized ranking table"""
+    competition = get_object_or_404(Competition, code=code)
+    not_modified = conditional_response(request, response, competition)
+    if not_modified:
+        return not_modified
+    return cached_json(
+        response, ('rankings', competition.pk, competition.data_version), [competition_scope(competition.pk)],
+        lambda: serialize(
+            List[RankingSchema],
+            Ranking.objects.filter(competition=competition).select_related('team').order_by('rank'),
+        ),
+    )
+
+
+@api.get("/competitions/{code}/opr", response=ContributionsSchema)
+def get_competition_opr(request, response: HttpResponse, code: str):
+    """OPR, DPR and CCWM per team for every metric, from played qualification matches"""
+    competition = get_object_or_404(Competition, code=code)
+    not_modified = conditional_response(request, response, competition)
+    if not_modified:
+        return not_modified
+
+    estimates = cached_contributions(competition)
+    order = estimates.opr[:, 0].argsort()[::-1]
+    return {
+        'metrics': METRICS,
+        'matches': estimates.matches,
+        'teams': [
+            {
+                'team_number': int(estimates.team_numbers[i]),
+                'opr': dict(zip(METRICS, estimates.opr[i].tolist())),
+                'dpr': dict(zip(METRICS, estimates.dpr[i].tolist())),
+                'ccwm': dict(zip(METRICS, estimates.ccwm[i].tolist())),
+            }
+            for i in order
+        ],
+    }
+
+
+@api.get("/competitions/{code}/predictions", response=List[MatchPredictionSchema])
+def get_match_predictions(request, response: HttpResponse, code: str):
+    """Win probability and expected fuel/points per alliance for every unplayed match"""
+    competition = get_object_or_404(Competition, code=code)
+    not_modified = conditional_response(request, response, competition)
+    if not_modified:
+        return not_modified
+    return cached_by_version(
+        'predictions', competition,
+        lambda: predict_matches(cached_contributions(competition), load_unplayed(competition.pk)),
+    )
+
+
+@api.get("/competitions/{code}/rank-projection", response=RankProjectionSchema)
+def get_rank_projection(request, response: HttpResponse, code: str, runs: int = Query(10000, ge=1, le=100000)):
+    """Distribution of final qualification rank and ranking points from Monte Carlo simulation of the remaining matches"""
+    competition = get_object_or_404(Competition, code=code)
+    not_modified = conditional_response(request, response, competition)
+    if not_modified:
+        return not_modified
+
+    return cached_by_version(
+        'rank-projection', competition,
+        lambda: projection_payload(project_rankings(load_projection_inputs(competition.pk), runs=runs)),
+        runs,
+    )
+
+
+@api.get("/competitions/{code}/shot-cycles", response=List[TeamShotCycleSchema])
+def get_competition_shot_cycles(request, response: HttpResponse, code: str):
+    """Shooting duty cycle, cycle counts and cycle/idle times per team over the competition"""
+    competition = get_object_or_404(Competition, code=code)
+    not_modified = conditional_response(request, response, competition)
+    if not_modified:
+        return not_modified
+    return cached_by_version('shot-cycles', competition, lambda: team_rollups(competition.pk))
+
+
+@api.get("/teams/{team_number}/shot-cycles", response=List[ShotCycleSummarySchema])
+def get_team_shot_cycles(request, response: HttpResponse, team_number: int, competition_code: str = None):
+    """Shooting cycle summary of a team for each match it has shot timings in"""
+    team = get_object_or_404(Team, number=team_number)
+    summaries = ShotCycleSummary.objects.select_related('competition', 'match').filter(team=team)
+    if competition_code:
+        competition = get_object_or_404(Competition, code=competition_code)
+        summaries = summaries.filter(competition=competition)
+        versions = [(competition.pk, competition.data_version)]
+    else:
+        versions = list(
+            Competition.objects.filter(shot_cycle_summaries__team=team).distinct().values_list('pk', 'data_version')
+        )
+    return cached_json(
+        response, ('team-shot-cycles', team.pk, competition_code, *versions),
+        [team_scope(team.pk), *(competition_scope(pk) for pk, _ in versions)],
+        lambda: serialize(
+            List[ShotCycleSummarySchema],
+            summaries.order_by('competition__name', 'match__match_type_order', 'match__match_number'),
+        ),
+    )
+
+
+@api.get("/competitions/{code}/schedule-analysis", response=ScheduleAnalysisSchema)
+def get_schedule_analysis(request, response: HttpResponse, code: str):
+    """Partner/opponent count matrices of the qualification schedule and strength of schedule per team"""
+    competition = get_object_or_404(Competition, code=code)
+    not_modified = conditional_response(request, response, competition)
+    if not_modified:
+        return not_modified
+
+    matrices = cached_matrices(competition)
+    return {
+        'team_numbers': matrices.team_numbers.tolist(),
+        'partners': matrices.partners.tolist(),
+        'opponents': matrices.opponents.tolist(),
+        'teams': strength_of_schedule(matrices, cached_contributions(competition)),
+    }
+
+
+@api.get("/competitions/{code}/picklist", response=PickListSchema)
+def get_pick_list(
+    request, response: HttpResponse, code: str,
+    alliance: List[int] = Query([], max_length=2), exclude: List[int] = Query([]), k: int = Query(10, ge=1, le=100),
+):
+    """
+    Best next picks for an alliance (captain first) and the best full
+    alliances containing it, skipping teams already taken by other alliances.
+    With no alliance given, ranks teams and alliances across the whole field.
+    """
+    competition = get_object_or_404(Competition, code=code)
+    not_modified = conditional_response(request, response, competition)
+    if not_modified:
+        return not_modified
+
+    def build():
+        model = picklist.load_model(competition.pk)
+        index = {number: i for i, number in enumerate(model.team_numbers)}
+        missing = [number for number in alliance + exclude if number not in index]
+        if missing:
+            raise HttpError(404, f"Teams not at {code}: {', '.join(map(str, missing))}")
+        members = tuple(index[number] for number in alliance)
+        excluded = [index[number] for number in exclude]
+        return {
+            'metrics': list(picklist.METRICS),
+            'picks': [
+                {
+                    'team_number': model.team_numbers[i],
+                    'value': value,
+                    'metrics': dict(zip(picklist.METRICS, model.vectors[i])),
+                }
+                for value, i in picklist.top_picks(model, members, k, excluded)
+            ],
+            'alliances': [
+                {'team_numbers': [model.team_numbers[i] for i in teams], 'value': value}
+                for value, teams in picklist.top_alliances(model, k, members, excluded)
+            ],
+        }
+
+    return cached_by_version('picklist', competition, build, tuple(alliance), tuple(sorted(exclude)), k)
+
 
 @api.post("/shot-timings", response=ShotTimingSchema)
 def create_shot_timing(request, competition_code: str, match_number: int, team_number: int, payload: ShotTimingCreateSchema):
@@ -92,6 +461,79 @@ def create_shot_timing(request, competition_code: str, match_number: int, team_n
     )
     return shot_timing
 
+@api.post("/shot-timings/batch", response=ShotTimingBatchResultSchema)
+def create_shot_timings_batch(request, competition_code: str, payload: List[ShotTimingBatchItemSchema]):
+    """
+    Insert many shot timings across matches and teams of one competition
+    with a constant number of queries. Items whose idempotency_key was
+    already stored (or repeats within the batch) are counted as duplicates.
+    """
+    competition = get_object_or_404(Competition, code=competition_code)
+    matches = {
+        (match.match_type, match.set_number, match.match_number): match
+        for match in Match.objects.filter(
+            competition=competition,
+            match_number__in={item.match_number for item in payload},
+        ).only('id', 'competition_id', 'match_type', 'set_number', 'match_number')
+    }
+    teams = {
+        team.number: team
+        for team in Team.objects.filter(number__in={item.team_number for item in payload})
+    }
+    seen_keys = set(
+        ShotTiming.objects.filter(
+            idempotency_key__in={item.idempotency_key for item in payload if item.idempotency_key}
+        ).values_list('idempotency_key', flat=True)
+    )
+
+    errors = []
+    duplicates = 0
+    shot_timings = []
+    for index, item in enumerate(payload):
+        if item.idempotency_key and item.idempotency_key in seen_keys:
+            duplicates += 1
+            continue
+        match = matches.get((item.match_type, item.set_number, item.match_number))
+        team = teams.get(item.team_number)
+        if match is None:
+            detail = f'Match {item.match_type} {item.set_number}-{item.match_number} not found in {competition_code}'
+        elif team is None:
+            detail = f'Team {item.team_number} not found'
+        elif item.end_shot_time < item.start_shot_time:
+            detail = 'end_shot_time is before start_shot_time'
+        else:
+            detail = None
+        if detail:
+            errors.append({'index': index, 'team_number': item.team_number, 'detail': detail})
+            continue
+
+        if item.idempotency_key:
+            seen_keys.add(item.idempotency_key)
+        shot_timings.append(ShotTiming(
+            match=match,
+            team=team,
+            start_shot_time=item.start_shot_time,
+            end_shot_time=item.end_shot_time,
+            idempotency_key=item.idempotency_key,
+        ))
+
+    if shot_timings:
+        with transaction.atomic():
+            version = bump_data_version(competition.pk)
+            for shot_timing in shot_timings:
+                shot_timing.data_version = version
+            # A concurrent retry may have stored the same key since the lookup above
+            ShotTiming.objects.bulk_create(shot_timings, ignore_conflicts=True)
+            # Within the competition only this batch stamps rows with its fresh version, so they count what was actually inserted
+            created = ShotTiming.objects.filter(match__competition=competition, data_version=version).count()
+            duplicates += len(shot_timings) - created
+            refresh_summaries({(shot_timing.match_id, shot_timing.team_id) for shot_timing in shot_timings})
+    else:
+        created = 0
+
+    return {'created': created, 'duplicates': duplicates, 'errors': errors}
+
+
 @api.get("/scary-api")
 def scary_api(request):
     return {"scary": "67"}
@@ -0,0 +1,100 @@
+"""
+Async versions of the hot read endpoints, mounted under /api/async/.
+
+They use Django's async ORM and cache APIs so that under an ASGI server
+(see README) a request waiting on the database does not hold a worker
+thread. Responses share cache entries with the sync endpoints.
+"""
+from ninja import Router
+from typing import List, Literal, Union
+from django.http import HttpResponse
+from django.shortcuts import aget_object_or_404
+from .models import Team, Competition, TeamInfo
+from .schemas import (
+    TeamSchema, CompetitionSchema, TeamInfoSchema,
+    MatchSchema, CompactMatchListSchema
+)
+from .compact import acompact_matches
+from .queries import competition_matches
+from .versioning import conditional_response
+from .response_cache import (
+    COMPETITIONS_SCOPE, competition_scope, team_scope,
+    acached_json, serialize
+)
+
+router = Router(tags=['async'])
+
+
+@router.get("/competitions", response=List[CompetitionSchema])
+async def list_competitions(request, response: HttpResponse):
+    async def build():
+        competitions = [competition async for competition in Competition.objects.all()]
+        return serialize(List[CompetitionSchema], competitions)
+
+    return await acached_json(response, ('competitions',), [COMPETITIONS_SCOPE], build)
+
+
+@router.get("/team-info", response=List[TeamInfoSchema])
+async def list_team_info(request, response: HttpResponse, competition_code: str, team_number: int = None):
+    competition = await aget_object_or_404(Competition, code=competition_code)
+    not_modified = conditional_response(request, response, competition)
+    if not_modified:
+        return not_modified
+
+    async def build():
+        queryset = TeamInfo.objects.select_related('team', 'competition').filter(competition=competition)
+        if team_number:
+            team = await aget_object_or_404(Team, number=team_number)
+            queryset = queryset.filter(team=team)
+        return serialize(List[TeamInfoSchema], [team_info async for team_info in queryset])
+
+    return await acached_json(
+        response, ('team-info', competition.pk, competition.data_version, team_number),
+        [competition_scope(competition.pk)], build,
+    )
+
+
+@router.get("/teams/{team_number}/competitions", response=List[CompetitionSchema])
+async def get_team_competitions(request, response: HttpResponse, team_number: int):
+    team = await aget_object_or_404(Team, number=team_number)
+
+    async def build():
+        queryset = Competition.objects.filter(results__team=team).distinct()
+        return serialize(List[CompetitionSchema], [competition async for competition in queryset])
+
+    return await acached_json(
+        response, ('team-competitions', team.pk), [COMPETITIONS_SCOPE, team_scope(team.pk)], build,
+    )
+
+
+@router.get("/competitions/{code}/teams", response=List[TeamSchema])
+async def get_competition_teams(request, response: HttpResponse, code: str):
+    competition = await aget_object_or_404(Competition, code=code)
+
+    async def build():
+        queryset = Team.objects.filter(results__competition=competition).distinct().order_by('number')
+        return serialize(List[TeamSchema], [team async for team in queryset])
+
+    return await acached_json(
+        response, ('competition-teams', competition.pk, competition.data_version),
+        [competition_scope(competition.pk)], build,
+    )
+
+
+@router.get("/competitions/{code}/matches", response=Union[List[MatchSchema], CompactMatchListSchema])
+async def get_competition_matches_by_code(request, response: HttpResponse, code: str, format: Literal['full', 'compact'] = 'full'):
+    competition = await aget_object_or_404(Competition, code=code)
+    not_modified = conditional_response(request, response, competition)
+    if not_modified:
+        return not_modified
+
+    async def build():
+        matches = competition_matches(competition)
+        if format == 'compact':
+            return serialize(CompactMatchListSchema, await acompact_matches(competition, matches))
+        return serialize(List[MatchSchema], [match async for match in matches])
+
+    return await acached_json(
+        response, ('matches', competition.pk, competition.data_version, format),
+        [competition_scope(competition.pk)], build,
+    )
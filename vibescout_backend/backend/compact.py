@@ -0,0 +1,63 @@
+from .models import Team
+
+TEAM_SLOTS = [
+    'blue_team_1', 'blue_team_2', 'blue_team_3',
+    'red_team_1', 'red_team_2', 'red_team_3',
+]
+
+# Same columns as MatchSchema, minus the competition which is sent once in the header
+MATCH_FIELDS = [
+    'match_number', 'set_number', 'match_type', 'has_played',
+    'predicted_match_time', 'start_match_time', 'end_match_time',
+    'blue_team_1', 'blue_team_2', 'blue_team_3',
+    'red_team_1', 'red_team_2', 'red_team_3', 'total_points',
+    'total_blue_fuels', 'total_red_fuels', 'blue_1_auto_fuel',
+    'blue_2_auto_fuel', 'blue_3_auto_fuel', 'red_1_auto_fuel',
+    'red_2_auto_fuel', 'red_3_auto_fuel', 'blue_1_teleop_fuel',
+    'blue_2_teleop_fuel', 'blue_3_teleop_fuel', 'red_1_teleop_fuel',
+    'red_2_teleop_fuel', 'red_3_teleop_fuel', 'blue_1_fuel_scored',
+    'blue_2_fuel_scored', 'blue_3_fuel_scored', 'red_1_fuel_scored',
+    'red_2_fuel_scored', 'red_3_fuel_scored', 'blue_1_climb',
+    'blue_2_climb', 'blue_3_climb', 'red_1_climb', 'red_2_climb',
+    'red_3_climb', 'calculated_points'
+]
+
+TEAM_SLOT_POSITIONS = [MATCH_FIELDS.index(slot) for slot in TEAM_SLOTS]
+
+
+def compact_payload(competition, rows, teams):
+    """
+    Build the compact match list: the competition and team dictionary once,
+    then one array per match in MATCH_FIELDS order where team slots hold the
+    index of the team in `teams` instead of a nested object.
+    """
+    team_index = {team.id: i for i, team in enumerate(teams)}
+    matches = []
+    for row in rows:
+        row = list(row)
+        for position in TEAM_SLOT_POSITIONS:
+            row[position] = team_index[row[position]]
+        matches.append(row)
+
+    return {
+        'competition': competition,
+        'teams': teams,
+        'fields': MATCH_FIELDS,
+        'matches': matches,
+    }
+
+
+def compact_matches(competition, matches):
+    """Compact representation of a match queryset in two queries"""
+    rows = list(matches.values_list(*MATCH_FIELDS))
+    team_ids = {row[position] for row in rows for position in TEAM_SLOT_POSITIONS}
+    teams = list(Team.objects.filter(id__in=team_ids).order_by('number'))
+    return compact_payload(competition, rows, teams)
+
+
+async def acompact_matches(competition, matches):
+    """Async variant of compact_matches for the ASGI read path"""
+    rows = [row async for row in matches.values_list(*MATCH_FIELDS)]
+    team_ids = {row[position] for row in rows for position in TEAM_SLOT_POSITIONS}
+    teams = [team async for team in Team.objects.filter(id__in=team_ids).order_by('number')]
+    return compact_payload(competition, rows, teams)
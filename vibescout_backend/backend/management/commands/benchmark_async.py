@@ -0,0 +1,93 @@
+import asyncio
+import statistics
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, override_settings
+from backend.models import Competition
+
+
+class Command(BaseCommand):
+    help = 'Compare sync and async read endpoint throughput through the in-process ASGI handler'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'competition_code',
+            type=str,
+            help='Competition code to read (e.g., TEST2026 from generate_competition)'
+        )
+        parser.add_argument(
+            '--clients',
+            type=int,
+            default=200,
+            help='Number of concurrent clients (default: 200)'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=2000,
+            help='Total requests per endpoint and mode (default: 2000)'
+        )
+        parser.add_argument(
+            '--no-cache',
+            action='store_true',
+            help='Disable the response cache so every request hits the database'
+        )
+
+    def handle(self, *args, **options):
+        code = options['competition_code']
+        if not Competition.objects.filter(code=code).exists():
+            self.stdout.write(self.style.ERROR(f'Competition {code} not found'))
+            return
+
+        paths = [
+            f'/competitions/{code}/matches',
+            f'/team-info?competition_code={code}',
+            f'/competitions/{code}/teams',
+            '/competitions',
+        ]
+
+        self.stdout.write(
+            f'{options["requests"]} requests per endpoint, {options["clients"]} concurrent clients, '
+            f'cache {"off" if options["no_cache"] else "on"}'
+        )
+        self.stdout.write(f'{"endpoint":<45} {"mode":<6} {"req/s":>9} {"p50 ms":>9} {"p95 ms":>9}')
+
+        # The test client always sends Host: testserver, which the ASGI scope cannot override
+        overrides = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver']}
+        if options['no_cache']:
+            overrides['CACHES'] = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        with override_settings(**overrides):
+            self.run_all(paths, options)
+
+    def run_all(self, paths, options):
+        for path in paths:
+            for mode, prefix in (('sync', '/api'), ('async', '/api/async')):
+                elapsed, latencies = asyncio.run(
+                    self.run_clients(prefix + path, options['clients'], options['requests'])
+                )
+                latencies.sort()
+                self.stdout.write(
+                    f'{path:<45} {mode:<6} '
+                    f'{len(latencies) / elapsed:>9.1f} '
+                    f'{statistics.median(latencies) * 1000:>9.1f} '
+                    f'{latencies[int(len(latencies) * 0.95) - 1] * 1000:>9.1f}'
+                )
+
+    async def run_clients(self, url, clients, total):
+        """Issue `total` GETs against the ASGI handler from `clients` concurrent tasks"""
+        client = AsyncClient()
+        latencies = []
+        remaining = iter(range(total))
+
+        async def worker():
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    raise RuntimeError(f'{url} returned {response.status_code}')
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        return time.perf_counter() - start, latencies
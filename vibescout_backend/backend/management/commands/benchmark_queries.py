@@ -0,0 +1,149 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from backend.models import Team, Competition, TeamInfo, Match, MatchParticipant, ShotTiming
+from backend.participants import participant_rows
+from backend.queries import competition_matches, team_matches
+
+
+class Command(BaseCommand):
+    help = 'Seed a synthetic season and report EXPLAIN QUERY PLAN output and timings for the API queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--competitions',
+            type=int,
+            default=40,
+            help='Number of synthetic competitions (default: 40)'
+        )
+        parser.add_argument(
+            '--teams',
+            type=int,
+            default=60,
+            help='Teams per competition (default: 60)'
+        )
+        parser.add_argument(
+            '--matches',
+            type=int,
+            default=100,
+            help='Qualification matches per competition (default: 100)'
+        )
+        parser.add_argument(
+            '--shots',
+            type=int,
+            default=10,
+            help='Shot timings per team per match (default: 10)'
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=20,
+            help='Timed runs per query (default: 20)'
+        )
+
+    def handle(self, *args, **options):
+        # Everything is seeded inside a transaction that is rolled back at the end
+        with transaction.atomic():
+            competition, team = self.seed(options)
+            self.report(self.queries(competition, team), options['runs'])
+            transaction.set_rollback(True)
+        self.stdout.write(self.style.SUCCESS('Synthetic data rolled back'))
+
+    def seed(self, options):
+        start = time.perf_counter()
+        rng = random.Random(0)
+        num_teams = options['teams']
+        pool = list(Team.objects.bulk_create(
+            Team(number=900000 + i, name=f'Bench Team {i}') for i in range(num_teams * 4)
+        ))
+        competitions = Competition.objects.bulk_create(
+            Competition(name=f'Bench Event {i}', code=f'BENCH{i:03d}') for i in range(options['competitions'])
+        )
+
+        for competition in competitions:
+            teams = rng.sample(pool, num_teams)
+            TeamInfo.objects.bulk_create(TeamInfo(team=team, competition=competition) for team in teams)
+            start_time = 1_700_000_000 + competition.pk * 86400
+            matches = []
+            for match_number in range(1, options['matches'] + 1):
+                slots = rng.sample(teams, 6)
+                matches.append(Match(
+                    competition=competition,
+                    match_number=match_number,
+                    match_type='qualification',
+                    has_played=True,
+                    blue_team_1=slots[0], blue_team_2=slots[1], blue_team_3=slots[2],
+                    red_team_1=slots[3], red_team_2=slots[4], red_team_3=slots[5],
+                    start_match_time=start_time + match_number * 480,
+                    data_version=match_number,
+                ))
+            matches = Match.objects.bulk_create(matches)
+            MatchParticipant.objects.bulk_create(row for match in matches for row in participant_rows(match))
+            ShotTiming.objects.bulk_create(
+                (
+                    ShotTiming(
+                        match=match,
+                        team_id=row.team_id,
+                        start_shot_time=shot * 12.0,
+                        end_shot_time=shot * 12.0 + rng.uniform(1, 5),
+                    )
+                    for match in matches
+                    for row in participant_rows(match)
+                    for shot in range(options['shots'])
+                ),
+                batch_size=5000,
+            )
+
+        self.stdout.write(
+            f'Seeded {Competition.objects.count()} competitions, {Match.objects.count()} matches, '
+            f'{ShotTiming.objects.count()} shot timings in {time.perf_counter() - start:.1f}s'
+        )
+        return competitions[len(competitions) // 2], pool[0]
+
+    def queries(self, competition, team):
+        match = Match.objects.filter(competition=competition).first()
+        first_start = competition.matches.order_by('start_match_time').first().start_match_time
+        return [
+            ('competition matches', competition_matches(competition)),
+            ('team info', TeamInfo.objects.select_related('team', 'competition').filter(competition=competition)),
+            ('competition teams', Team.objects.filter(results__competition=competition).distinct().order_by('number')),
+            ('team competitions', Competition.objects.filter(results__team=team).distinct()),
+            ('team matches', team_matches(team)),
+            ('team matches in competition', team_matches(team, competition)),
+            ('match sync delta', competition_matches(competition).filter(data_version__gt=90)),
+            ('shot timings for match/team', ShotTiming.objects.filter(match=match, team_id=match.blue_team_1_id)),
+            ('matches by start time', Match.objects.filter(
+                competition=competition, start_match_time__gt=0
+            ).order_by('start_match_time')),
+            ('first match of day 2', Match.objects.filter(
+                competition=competition,
+                start_match_time__gte=first_start + 12 * 3600,
+                start_match_time__lt=first_start + 36 * 3600,
+            ).order_by('start_match_time')[:1]),
+        ]
+
+    def report(self, queries, runs):
+        for name, queryset in queries:
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                rows = len(list(queryset.all()))
+                timings.append(time.perf_counter() - start)
+
+            plan = queryset.explain()
+            style = self.style.WARNING if self.scans_table(plan) else self.style.SUCCESS
+            self.stdout.write(style(
+                f'\n{name}: {rows} rows, median {statistics.median(timings) * 1000:.2f} ms, '
+                f'max {max(timings) * 1000:.2f} ms'
+            ))
+            for line in plan.splitlines():
+                self.stdout.write(f'    {line}')
+
+    def scans_table(self, plan):
+        """A full SCAN of a data table (not a covering index) means a missing index"""
+        return any(
+            'SCAN ' in line and 'USING' not in line and 'SUBQUERY' not in line
+            for line in plan.splitlines()
+        )
@@ -1,7 +1,7 @@
 import random
 from django.core.management.base import BaseCommand
-from django.db import models
-from backend.models import Team, Competition, TeamInfo, Match
+from backend.models import Team, Competition, TeamInfo, Match, Ranking
+from backend.versioning import stamp_bulk_data_version
 
 
 class Command(BaseCommand):
@@ -172,108 +172,27 @@ class Command(BaseCommand):
             ])
             
             match.save()
-            
-            # Update team rankings based on match results
-            blue_score = match.total_blue_fuels
-            red_score = match.total_red_fuels
-            
-            if blue_score > red_score:
-                rp_blue = 2.0
-                rp_red = 0.0
-                for team in blue_teams:
-                    team_info = TeamInfo.objects.get(team=team, competition=competition)
-                    team_info.win += 1
-                    team_info.ranking_points += rp_blue
-                    team_info.save()
-                for team in red_teams:
-                    team_info = TeamInfo.objects.get(team=team, competition=competition)
-                    team_info.lose += 1
-                    team_info.ranking_points += rp_red
-                    team_info.save()
-            elif red_score > blue_score:
-                rp_blue = 0.0
-                rp_red = 2.0
-                for team in blue_teams:
-                    team_info = TeamInfo.objects.get(team=team, competition=competition)
-                    team_info.lose += 1
-                    team_info.ranking_points += rp_blue
-                    team_info.save()
-                for team in red_teams:
-                    team_info = TeamInfo.objects.get(team=team, competition=competition)
-                    team_info.win += 1
-                    team_info.ranking_points += rp_red
-                    team_info.save()
-            else:
-                rp_blue = 1.0
-                rp_red = 1.0
-                for team in blue_teams + red_teams:
-                    team_info = TeamInfo.objects.get(team=team, competition=competition)
-                    team_info.tie += 1
-                    team_info.ranking_points += 1.0
-                    team_info.save()
 
-        # Calculate average stats for each team
+        # Averages are maintained incrementally by the aggregate engine as matches are saved;
+        # only accuracy is simulated here
         self.stdout.write('Calculating team statistics...')
-        for team in teams:
-            team_info = TeamInfo.objects.get(team=team, competition=competition)
-            
-            # Get all matches for this team
-            team_matches = Match.objects.filter(
-                competition=competition,
-                has_played=True
-            ).filter(
-                models.Q(blue_team_1=team) | models.Q(blue_team_2=team) | models.Q(blue_team_3=team) |
-                models.Q(red_team_1=team) | models.Q(red_team_2=team) | models.Q(red_team_3=team)
-            )
-            
-            if team_matches.exists():
-                total_fuel = 0
-                total_auto_fuel = 0
-                total_climb_points = 0
-                match_count = team_matches.count()
-                
-                for match in team_matches:
-                    # Find which position this team was in
-                    for i in range(1, 4):
-                        if getattr(match, f'blue_team_{i}') == team:
-                            total_fuel += getattr(match, f'blue_{i}_fuel_scored')
-                            total_auto_fuel += getattr(match, f'blue_{i}_auto_fuel')
-                            climb = getattr(match, f'blue_{i}_climb')
-                            if climb == 'L1':
-                                total_climb_points += 3
-                            elif climb == 'L2':
-                                total_climb_points += 6
-                            elif climb == 'L3':
-                                total_climb_points += 10
-                            break
-                        elif getattr(match, f'red_team_{i}') == team:
-                            total_fuel += getattr(match, f'red_{i}_fuel_scored')
-                            total_auto_fuel += getattr(match, f'red_{i}_auto_fuel')
-                            climb = getattr(match, f'red_{i}_climb')
-                            if climb == 'L1':
-                                total_climb_points += 3
-                            elif climb == 'L2':
-                                total_climb_points += 6
-                            elif climb == 'L3':
-                                total_climb_points += 10
-                            break
-                
-                team_info.avg_fuel_scored = total_fuel / match_count
-                team_info.avg_auto_fuel = total_auto_fuel / match_count
-                team_info.avg_climb_points = total_climb_points / match_count
-                team_info.accuracy = random.uniform(0.6, 0.95)  # Simulated accuracy
-                team_info.save()
+        team_infos = list(TeamInfo.objects.filter(competition=competition, matches_played__gt=0))
+        for team_info in team_infos:
+            team_info.accuracy = random.uniform(0.6, 0.95)  # Simulated accuracy
+        TeamInfo.objects.bulk_update(team_infos, ['accuracy'])
+        stamp_bulk_data_version(TeamInfo, [team_info.pk for team_info in team_infos], competition.pk)
 
         # Display final rankings
         self.stdout.write(self.style.SUCCESS('\n=== Final Rankings ==='))
-        rankings = TeamInfo.objects.filter(competition=competition).order_by('-ranking_points', '-win')
+        # Ranking points and ranks are maintained by the rankings engine as matches are saved
+        rankings = Ranking.objects.filter(competition=competition).select_related('team').order_by('rank')
         
-        for rank, team_info in enumerate(rankings, 1):
+        for ranking in rankings:
             self.stdout.write(
-                f'{rank:2d}. Team {team_info.team.number}: '
-                f'{team_info.ranking_points:.1f} RP '
-                f'({team_info.win}W-{team_info.lose}L-{team_info.tie}T) '
-                f'Power: {team_powers[team_info.team.id]:.1f}'
+                f'{ranking.rank:2d}. Team {ranking.team.number}: '
+                f'{ranking.ranking_points:.1f} RP '
+                f'({ranking.wins}W-{ranking.losses}L-{ranking.ties}T) '
+                f'Power: {team_powers[ranking.team.id]:.1f}'
             )
         
         # Form playoff alliances (top 8 alliances, 1-2-3 format)
@@ -0,0 +1,63 @@
+import time
+from django.core.management.base import BaseCommand
+from backend.models import Competition
+from backend.tba import map_match, upsert_matches
+from backend.tba_dump import iter_dump_matches
+
+
+class Command(BaseCommand):
+    help = 'Import matches from recorded TBA JSON dumps (files or directories) without calling the API'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='+',
+            type=str,
+            help='Dump files or directories of *.json dumps (e.g., ../2020_data)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Matches written per bulk upsert (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        competitions = {}
+        pending = {}  # event key -> mapped rows not yet written
+        counts = {}   # event key -> [created, updated, skipped]
+        start = time.perf_counter()
+
+        def flush(event_key):
+            rows = pending.pop(event_key, [])
+            if rows:
+                # Stats move by each batch's matches, so batches of one event can land in any order
+                created, updated = upsert_matches(competitions[event_key], rows, incremental=True)
+                counts[event_key][0] += created
+                counts[event_key][1] += updated
+
+        for path, match_data in iter_dump_matches(options['paths']):
+            event_key = match_data.get('event_key') or match_data.get('key', '').split('_')[0]
+            if event_key not in competitions:
+                competition, created = Competition.objects.get_or_create(code=event_key, defaults={'name': event_key})
+                competitions[event_key] = competition
+                counts[event_key] = [0, 0, 0]
+                self.stdout.write(f'{"Created" if created else "Using existing"} competition {event_key} (from {path.name})')
+
+            row = map_match(match_data)
+            if row is None:
+                counts[event_key][2] += 1
+                continue
+            pending.setdefault(event_key, []).append(row)
+            if len(pending[event_key]) >= batch_size:
+                flush(event_key)
+
+        for event_key in list(pending):
+            flush(event_key)
+
+        for event_key, (created, updated, skipped) in counts.items():
+            self.stdout.write(self.style.SUCCESS(f'  {event_key}: {created} created, {updated} updated'))
+            if skipped:
+                self.stdout.write(self.style.WARNING(f'  {event_key}: skipped {skipped} matches with incomplete teams'))
+        self.stdout.write(f'Imported {len(counts)} events in {time.perf_counter() - start:.2f}s')
@@ -1,10 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from django.core.management.base import BaseCommand
 from django.db import transaction
 import tbapy
 import os
+import time
 from pathlib import Path
 from dotenv import load_dotenv
-from backend.models import Team, Competition, Match, TeamInfo
+from backend.models import Competition, Match
+from backend.tba import map_match, upsert_matches
 
 
 class Command(BaseCommand):
@@ -23,6 +26,12 @@ class Command(BaseCommand):
             default='',
             help='TBA API key (or set TBA_API_KEY environment variable)'
         )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Events fetched from TBA in parallel (default: 4)'
+        )
 
     def handle(self, *args, **options):
         env_path = Path(__file__).resolve().parent.parent.parent.parent.parent / '.env'
@@ -40,11 +49,31 @@ class Command(BaseCommand):
             return
 
         tba = tbapy.TBA(api_key)
-        
-        for event_key in options['event_keys']:
+        event_keys = options['event_keys']
+
+        # Fetch phase: network calls for all events run concurrently, outside any transaction
+        start = time.perf_counter()
+        fetched = {}
+        with ThreadPoolExecutor(max_workers=max(1, options['concurrency'])) as pool:
+            futures = {pool.submit(self.fetch_event, tba, event_key): event_key for event_key in event_keys}
+            for future in as_completed(futures):
+                event_key = futures[future]
+                try:
+                    fetched[event_key] = future.result()
+                except Exception as e:
+                    self.stdout.write(self.style.ERROR(
+                        f'Error fetching {event_key}: {str(e)}'
+                    ))
+        self.stdout.write(f'Fetched {len(fetched)}/{len(event_keys)} events in {time.perf_counter() - start:.2f}s')
+
+        # Write phase: one short transaction per event, no network calls inside
+        for event_key in event_keys:
+            if event_key not in fetched:
+                continue
             self.stdout.write(f'Processing event: {event_key}')
             try:
-                self.import_event(tba, event_key)
+                event_info, matches = fetched[event_key]
+                self.import_event(event_key, event_info, matches)
                 self.stdout.write(self.style.SUCCESS(
                     f'Successfully imported {event_key}'
                 ))
@@ -53,10 +82,11 @@ class Command(BaseCommand):
                     f'Error importing {event_key}: {str(e)}'
                 ))
 
+    def fetch_event(self, tba, event_key):
+        return tba.event(event_key), tba.event_matches(event_key)
+
     @transaction.atomic
-    def import_event(self, tba, event_key):
-        event_info = tba.event(event_key)
-        
+    def import_event(self, event_key, event_info, matches):
         defaults = {'name': event_info['name']}
         
         # Add stream links for specific competitions
@@ -90,183 +120,29 @@ class Command(BaseCommand):
         else:
             self.stdout.write(f'  Using existing competition: {competition.name}')
         
-        matches = tba.event_matches(event_key)
         self.stdout.write(f'  Found {len(matches)} matches')
         
-        teams_in_event = set()
+        rows = []
         for match_data in matches:
-            match_teams = self.import_match(match_data, competition)
-            teams_in_event.update(match_teams)
-        
-        self.stdout.write(f'  Imported {len(matches)} matches for {event_key}')
-        
-        self.create_team_infos(teams_in_event, competition)
-        self.stdout.write(f'  Created/verified TeamInfo records for {len(teams_in_event)} teams')
+            row = map_match(match_data)
+            if row is None:
+                self.stdout.write(self.style.WARNING(
+                    f'  Skipping match {match_data.get("key")} - incomplete teams'
+                ))
+                continue
+            rows.append(row)
+        
+        # Teams, matches and TeamInfo are bulk written, and aggregates and rankings rebuilt, in constant queries
+        created_matches, updated_matches = upsert_matches(competition, rows)
+        self.stdout.write(
+            f'  Imported {len(rows)} matches for {event_key} '
+            f'({created_matches} created, {updated_matches} updated)'
+        )
         
         # Calculate and set offsets for 2025gacmp
         if event_key == '2025gacmp':
             self.calculate_and_set_offsets(competition, stream_time_day_1, stream_time_day_2, stream_time_day_3)
 
-    def import_match(self, match_data, competition):
-        alliances = match_data.get('alliances', {})
-        blue_alliance = alliances.get('blue', {})
-        red_alliance = alliances.get('red', {})
-        
-        blue_team_keys = blue_alliance.get('team_keys', [])
-        red_team_keys = red_alliance.get('team_keys', [])
-        
-        if len(blue_team_keys) < 3 or len(red_team_keys) < 3:
-            self.stdout.write(self.style.WARNING(
-                f'  Skipping match {match_data.get("key")} - incomplete teams'
-            ))
-            return
-        
-        match_number = match_data.get('match_number', 0)
-        tba_key = match_data.get('key', '')
-        
-        # Determine match type from TBA comp_level
-        comp_level = match_data.get('comp_level', 'qm')
-        match_type_map = {
-            'qm': 'qualification',
-            'qf': 'quarterfinal',
-            'sf': 'semifinal',
-            'f': 'final',
-        }
-        match_type = match_type_map.get(comp_level, 'qualification')
-        
-        # Extract set_number from TBA key (e.g., qf1m1 -> set 1, qf2m1 -> set 2)
-        # For qualification matches, set_number is always 1
-        set_number = 1
-        if comp_level in ['qf', 'sf', 'f']:
-            import re
-            # Match pattern like 'qf1', 'sf2', 'f1' in the key
-            match_pattern = re.search(r'_(' + comp_level + r')(\d+)m', tba_key)
-            if match_pattern:
-                set_number = int(match_pattern.group(2))
-        
-        blue_teams = [self.get_or_create_team(key) for key in blue_team_keys[:3]]
-        red_teams = [self.get_or_create_team(key) for key in red_team_keys[:3]]
-        
-        score_breakdown = match_data.get('score_breakdown', {})
-        blue_breakdown = score_breakdown.get('blue', {})
-        red_breakdown = score_breakdown.get('red', {})
-        
-        blue_score = blue_alliance.get('score', 0) or 0
-        red_score = red_alliance.get('score', 0) or 0
-        
-        # Extract year from event key to determine game-specific scoring
-        year = int(tba_key[:4])
-        
-        # Initialize scoring variables
-        total_blue_fuels = 0
-        total_red_fuels = 0
-        blue_auto_cells = 0
-        red_auto_cells = 0
-        blue_teleop_cells = 0
-        red_teleop_cells = 0
-        
-        if year == 2020:
-            # 2020 Infinite Recharge scoring
-            blue_auto_cells = (
-                blue_breakdown.get('autoCellsBottom', 0) +
-                blue_breakdown.get('autoCellsOuter', 0) +
-                blue_breakdown.get('autoCellsInner', 0)
-            )
-            red_auto_cells = (
-                red_breakdown.get('autoCellsBottom', 0) +
-                red_breakdown.get('autoCellsOuter', 0) +
-                red_breakdown.get('autoCellsInner', 0)
-            )
-            
-            blue_teleop_cells = (
-                blue_breakdown.get('teleopCellsBottom', 0) +
-                blue_breakdown.get('teleopCellsOuter', 0) +
-                blue_breakdown.get('teleopCellsInner', 0)
-            )
-            red_teleop_cells = (
-                red_breakdown.get('teleopCellsBottom', 0) +
-                red_breakdown.get('teleopCellsOuter', 0) +
-                red_breakdown.get('teleopCellsInner', 0)
-            )
-            
-            total_blue_fuels = blue_auto_cells + blue_teleop_cells
-            total_red_fuels = red_auto_cells + red_teleop_cells
-        elif year == 2025:
-            # 2025 Reefscape scoring - adapt based on actual game pieces
-            # For now, use generic scoring from breakdown if available
-            # You may need to adjust these field names based on actual 2025 API structure
-            blue_auto_cells = blue_breakdown.get('autoGamePieceCount', 0)
-            red_auto_cells = red_breakdown.get('autoGamePieceCount', 0)
-            blue_teleop_cells = blue_breakdown.get('teleopGamePieceCount', 0)
-            red_teleop_cells = red_breakdown.get('teleopGamePieceCount', 0)
-            total_blue_fuels = blue_auto_cells + blue_teleop_cells
-            total_red_fuels = red_auto_cells + red_teleop_cells
-        
-        # Extract time fields from TBA API
-        predicted_match_time = match_data.get('predicted_time', 0) or 0
-        start_match_time = match_data.get('actual_time', 0) or 0
-        end_match_time = match_data.get('post_result_time', 0) or 0
-        
-        # Map climb values based on year
-        def map_climb(endgame_value, year):
-            if year == 2020:
-                # 2020: Park->L1, Hang->L3
-                if endgame_value == 'Park':
-                    return 'L1'
-                elif endgame_value == 'Hang':
-                    return 'L3'
-            elif year == 2025:
-                # 2025: Map based on actual endgame values
-                # Adjust these mappings based on 2025 game manual
-                if endgame_value in ['Shallow', 'Park']:
-                    return 'L1'
-                elif endgame_value == 'Deep':
-                    return 'L2'
-                elif endgame_value in ['Cage', 'High']:
-                    return 'L3'
-            return 'None'
-        
-        match, created = Match.objects.update_or_create(
-            competition=competition,
-            match_type=match_type,
-            set_number=set_number,
-            match_number=match_number,
-            defaults={
-                'predicted_match_time': predicted_match_time,
-                'start_match_time': start_match_time,
-                'end_match_time': end_match_time,
-                'blue_team_1': blue_teams[0],
-                'blue_team_2': blue_teams[1],
-                'blue_team_3': blue_teams[2],
-                'red_team_1': red_teams[0],
-                'red_team_2': red_teams[1],
-                'red_team_3': red_teams[2],
-                'total_points': blue_score + red_score,
-                'total_blue_fuels': total_blue_fuels,
-                'total_red_fuels': total_red_fuels,
-                'blue_1_climb': map_climb(blue_breakdown.get('endgameRobot1', 'None'), year),
-                'blue_2_climb': map_climb(blue_breakdown.get('endgameRobot2', 'None'), year),
-                'blue_3_climb': map_climb(blue_breakdown.get('endgameRobot3', 'None'), year),
-                'red_1_climb': map_climb(red_breakdown.get('endgameRobot1', 'None'), year),
-                'red_2_climb': map_climb(red_breakdown.get('endgameRobot2', 'None'), year),
-                'red_3_climb': map_climb(red_breakdown.get('endgameRobot3', 'None'), year),
-                'calculated_points': blue_score + red_score,
-            }
-        )
-        
-        if created:
-            self.stdout.write(f'    Created match: {match_data.get("key")}')
-        
-        return blue_teams + red_teams
-
-    def get_or_create_team(self, team_key):
-        team_number = int(team_key.replace('frc', ''))
-        team, created = Team.objects.get_or_create(
-            number=team_number,
-            defaults={'name': f'Team {team_number}'}
-        )
-        return team
-    
     def calculate_and_set_offsets(self, competition, stream_time_day_1, stream_time_day_2, stream_time_day_3):
         """Calculate offsets based on first match of each day and stream timestamps"""
         from django.db.models import Min
@@ -306,18 +182,3 @@ class Command(BaseCommand):
         
         competition.save()
         self.stdout.write(self.style.SUCCESS('  ✓ Offsets calculated and saved'))
-    
-    def create_team_infos(self, teams, competition):
-        for team in teams:
-            team_info, created = TeamInfo.objects.get_or_create(
-                team=team,
-                competition=competition,
-                defaults={
-                    'ranking_points': 0.0,
-                    'tie': 0,
-                    'win': 0,
-                    'lose': 0,
-                }
-            )
-            if created:
-                self.stdout.write(f'    Created TeamInfo for Team {team.number} in {competition.name}')
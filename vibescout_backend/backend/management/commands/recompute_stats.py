@@ -0,0 +1,103 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+from backend.models import Competition, Match
+from backend.analytics.aggregates import STAT_FIELDS, compute_team_totals, write_team_totals
+from backend.analytics.opr import MATCH_FIELDS, alliance_data, solve_contributions
+from backend.analytics.rankings import compute_rankings, write_rankings
+from backend.response_cache import cache_is_shared, prime_by_version
+
+
+def compute_competition(competition_id):
+    """
+    Worker: read a competition's matches once and compute its derived stats.
+    Nothing is written here; the parent process applies the results.
+    """
+    start = time.perf_counter()
+    # One read carries the fields of every stat: aggregates, rankings and OPR
+    rows = list(
+        Match.objects.filter(competition_id=competition_id, has_played=True)
+        .values(*dict.fromkeys(STAT_FIELDS + MATCH_FIELDS))
+    )
+    read = time.perf_counter()
+    totals = compute_team_totals(rows)
+    results = compute_rankings(rows)
+    estimates = solve_contributions(*alliance_data(row for row in rows if row['match_type'] == 'qualification'))
+    connections.close_all()
+    return {
+        'competition_id': competition_id,
+        'matches': len(rows),
+        'totals': totals,
+        'results': results,
+        'estimates': estimates,
+        'read': read - start,
+        'compute': time.perf_counter() - read,
+    }
+
+
+class Command(BaseCommand):
+    help = 'Recompute derived stats (TeamInfo aggregates, rankings, OPR) for every or selected competitions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'codes',
+            nargs='*',
+            type=str,
+            help='Competition codes to recompute (default: all competitions)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes computing stats (default: number of CPUs)'
+        )
+
+    def handle(self, *args, **options):
+        competitions = Competition.objects.order_by('code')
+        if options['codes']:
+            competitions = competitions.filter(code__in=options['codes'])
+            missing = set(options['codes']) - set(competitions.values_list('code', flat=True))
+            if missing:
+                self.stdout.write(self.style.WARNING(f'Unknown competitions skipped: {", ".join(sorted(missing))}'))
+        competitions = {competition.pk: competition for competition in competitions}
+        if not competitions:
+            self.stdout.write(self.style.WARNING('No competitions to recompute'))
+            return
+
+        workers = max(1, min(options['workers'], len(competitions)))
+        self.stdout.write(f'Recomputing {len(competitions)} competitions with {workers} workers...')
+        start = time.perf_counter()
+
+        if workers == 1:
+            results = map(compute_competition, competitions)
+            self.apply_all(competitions, results)
+        else:
+            # Forked workers must not inherit open database connections
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+                self.apply_all(competitions, pool.map(compute_competition, competitions))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Recomputed {len(competitions)} competitions in {time.perf_counter() - start:.2f}s'
+        ))
+
+    def apply_all(self, competitions, results):
+        # Workers compute in parallel while the parent writes finished competitions one at a time
+        for result in results:
+            competition = competitions[result['competition_id']]
+            start = time.perf_counter()
+            write_team_totals(competition.pk, result['totals'])
+            write_rankings(competition.pk, result['results'])
+            if cache_is_shared():
+                # API processes only see the estimates through a shared cache backend
+                competition.refresh_from_db(fields=['data_version'])
+                prime_by_version('opr', competition, result['estimates'])
+            write = time.perf_counter() - start
+            self.stdout.write(
+                f'  {competition.code}: {result["matches"]} played matches, '
+                f'read {result["read"] * 1000:.0f}ms, compute {result["compute"] * 1000:.0f}ms, '
+                f'write {write * 1000:.0f}ms'
+            )
@@ -0,0 +1,64 @@
+import json
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from django.core.management.base import BaseCommand
+from backend.tba_sync import payload_hash, recording_name
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    """Serves recorded TBA responses under /api/v3, answering conditional requests with 304"""
+    directory = None
+    prefix = '/api/v3'
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if not path.startswith(self.prefix):
+            self.send_error(404)
+            return
+        recording = self.directory / recording_name(path[len(self.prefix):])
+        if not recording.exists():
+            self.send_error(404)
+            return
+
+        # Files are re-read on every request so editing a recording simulates an upstream change
+        stat = recording.stat()
+        recorded = json.loads(recording.read_text())
+        body = recorded['body'] if isinstance(recorded, dict) and 'body' in recorded else recorded
+        etag = f'W/"{payload_hash(body)}"'
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            self.end_headers()
+            return
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class Command(BaseCommand):
+    help = 'Serve TBA responses recorded with sync_tba_events --record as a local stand-in for the TBA API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', type=str, help='Directory of recorded responses')
+        parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+
+    def handle(self, *args, **options):
+        handler = type('Handler', (RecordingHandler,), {'directory': Path(options['directory'])})
+        server = ThreadingHTTPServer(('127.0.0.1', options['port']), handler)
+        self.stdout.write(f'Serving {options["directory"]} at http://127.0.0.1:{options["port"]}/api/v3')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,67 @@
+import os
+import time
+from pathlib import Path
+from django.core.management.base import BaseCommand
+from dotenv import load_dotenv
+from backend.tba_sync import TBA_BASE_URL, TbaClient, sync_event
+
+
+class Command(BaseCommand):
+    help = 'Incrementally sync events from The Blue Alliance, writing only matches that changed since the last sync'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'event_keys',
+            nargs='+',
+            type=str,
+            help='Event keys to sync (e.g., 2020gagai 2020gadal)'
+        )
+        parser.add_argument(
+            '--api-key',
+            type=str,
+            default='',
+            help='TBA API key (or set TBA_API_KEY environment variable)'
+        )
+        parser.add_argument(
+            '--base-url',
+            type=str,
+            default=TBA_BASE_URL,
+            help='TBA API base URL, e.g. a local serve_tba_recordings server (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--record',
+            type=str,
+            default='',
+            help='Directory to record every TBA response into, for offline replay'
+        )
+
+    def handle(self, *args, **options):
+        env_path = Path(__file__).resolve().parent.parent.parent.parent.parent / '.env'
+        if env_path.exists():
+            load_dotenv(env_path)
+
+        api_key = options['api_key'] or os.environ.get('TBA_API_KEY', '')
+        if not api_key:
+            self.stdout.write(self.style.ERROR(
+                'API key required. Provide via --api-key or TBA_API_KEY environment variable'
+            ))
+            return
+
+        client = TbaClient(api_key, base_url=options['base_url'], record_dir=options['record'] or None)
+        for event_key in options['event_keys']:
+            start = time.perf_counter()
+            try:
+                result = sync_event(client, event_key)
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'Error syncing {event_key}: {str(e)}'))
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+            if result.not_modified:
+                self.stdout.write(f'{event_key}: not modified ({elapsed:.0f}ms)')
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f'{event_key}: {result.changed}/{result.matches} matches changed, '
+                f'{result.created} created, {result.updated} updated ({elapsed:.0f}ms)'
+            ))
+            if result.skipped:
+                self.stdout.write(self.style.WARNING(f'  Skipped {result.skipped} matches with incomplete teams'))
@@ -0,0 +1,79 @@
+import asyncio
+import os
+import signal
+from pathlib import Path
+from django.core.management.base import BaseCommand
+from dotenv import load_dotenv
+from backend.tba_live import PollSchedule, watch_events
+from backend.tba_sync import TBA_BASE_URL, TbaClient
+
+
+class Command(BaseCommand):
+    help = 'Keep active events in sync with The Blue Alliance, polling faster around scheduled matches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'event_keys',
+            nargs='+',
+            type=str,
+            help='Event keys to watch (e.g., 2026gagai 2026gadal)'
+        )
+        parser.add_argument(
+            '--api-key',
+            type=str,
+            default='',
+            help='TBA API key (or set TBA_API_KEY environment variable)'
+        )
+        parser.add_argument(
+            '--base-url',
+            type=str,
+            default=TBA_BASE_URL,
+            help='TBA API base URL, e.g. a local serve_tba_recordings server (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--min-interval',
+            type=float,
+            default=10.0,
+            help='Seconds between polls while a match is due (default: 10)'
+        )
+        parser.add_argument(
+            '--max-interval',
+            type=float,
+            default=300.0,
+            help='Seconds between polls between sessions (default: 300)'
+        )
+        parser.add_argument(
+            '--max-backoff',
+            type=float,
+            default=600.0,
+            help='Longest delay between retries after errors, in seconds (default: 600)'
+        )
+
+    def handle(self, *args, **options):
+        env_path = Path(__file__).resolve().parent.parent.parent.parent.parent / '.env'
+        if env_path.exists():
+            load_dotenv(env_path)
+
+        api_key = options['api_key'] or os.environ.get('TBA_API_KEY', '')
+        if not api_key:
+            self.stdout.write(self.style.ERROR(
+                'API key required. Provide via --api-key or TBA_API_KEY environment variable'
+            ))
+            return
+
+        client = TbaClient(api_key, base_url=options['base_url'])
+        schedule = PollSchedule(
+            min_interval=options['min_interval'],
+            max_interval=max(options['min_interval'], options['max_interval']),
+            max_backoff=options['max_backoff'],
+        )
+        self.stdout.write(f'Watching {", ".join(options["event_keys"])} (Ctrl+C to stop)')
+        asyncio.run(self.watch(client, options['event_keys'], schedule))
+        self.stdout.write('Stopped')
+
+    async def watch(self, client, event_keys, schedule):
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await watch_events(client, event_keys, schedule, stop, report=self.stdout.write)
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-17 18:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0009_competition_offset_stream_time_to_unix_timestamp_day_1_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competition',
+            name='data_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='competition',
+            name='data_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
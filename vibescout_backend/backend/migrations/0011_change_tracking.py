@@ -0,0 +1,58 @@
+# Generated by Django 6.0.1 on 2026-10-17 18:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0010_competition_data_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('match', 'Match'), ('team_info', 'Team Info'), ('shot_timing', 'Shot Timing')], max_length=20)),
+                ('key', models.JSONField()),
+                ('data_version', models.PositiveIntegerField()),
+            ],
+            options={
+                'ordering': ['data_version'],
+            },
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='data_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='shottiming',
+            name='data_version',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='teaminfo',
+            name='data_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['competition', 'data_version'], name='backend_mat_competi_a27467_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teaminfo',
+            index=models.Index(fields=['competition', 'data_version'], name='backend_tea_competi_5af344_idx'),
+        ),
+        migrations.AddField(
+            model_name='deletedrecord',
+            name='competition',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deleted_records', to='backend.competition'),
+        ),
+        migrations.AddIndex(
+            model_name='deletedrecord',
+            index=models.Index(fields=['competition', 'data_version'], name='backend_del_competi_7e72f4_idx'),
+        ),
+    ]
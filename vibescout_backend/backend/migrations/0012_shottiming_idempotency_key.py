@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 18:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0011_change_tracking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shottiming',
+            name='idempotency_key',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.1 on 2026-10-17 18:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_participants(apps, schema_editor):
+    Match = apps.get_model('backend', 'Match')
+    MatchParticipant = apps.get_model('backend', 'MatchParticipant')
+    rows = []
+    for match in Match.objects.all().iterator():
+        for alliance in ('blue', 'red'):
+            for station in (1, 2, 3):
+                rows.append(MatchParticipant(
+                    match_id=match.pk,
+                    team_id=getattr(match, f'{alliance}_team_{station}_id'),
+                    competition_id=match.competition_id,
+                    alliance=alliance,
+                    station=station,
+                ))
+    MatchParticipant.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0012_shottiming_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alliance', models.CharField(choices=[('blue', 'Blue'), ('red', 'Red')], max_length=4)),
+                ('station', models.PositiveSmallIntegerField()),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='backend.competition')),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='backend.match')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participations', to='backend.team')),
+            ],
+            options={
+                'ordering': ['match', 'alliance', 'station'],
+                'indexes': [models.Index(fields=['team', 'competition'], name='backend_mat_team_id_77a5df_idx')],
+                'unique_together': {('match', 'alliance', 'station')},
+            },
+        ),
+        migrations.RunPython(backfill_participants, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-17 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0013_matchparticipant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='match_type_order',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(match_type='qualification', then=1), models.When(match_type='quarterfinal', then=2), models.When(match_type='semifinal', then=3), models.When(match_type='final', then=4), default=5), output_field=models.IntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['competition', 'match_type_order', 'match_number'], name='backend_mat_competi_855845_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['competition', 'match_type', 'set_number', 'match_number'], name='backend_mat_competi_2d66e6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['competition', 'start_match_time'], name='backend_mat_competi_728ccd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shottiming',
+            index=models.Index(fields=['match', 'team', 'start_shot_time'], name='backend_sho_match_i_a6cb5f_idx'),
+        ),
+    ]
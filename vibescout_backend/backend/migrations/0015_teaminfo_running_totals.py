@@ -0,0 +1,67 @@
+# Generated by Django 6.0.1 on 2026-10-17 18:42
+
+from django.db import migrations, models
+
+
+CLIMB_POINTS = {'L1': 3, 'L2': 6, 'L3': 10}
+
+
+def backfill_totals(apps, schema_editor):
+    Match = apps.get_model('backend', 'Match')
+    TeamInfo = apps.get_model('backend', 'TeamInfo')
+    totals = {}
+    for match in Match.objects.filter(has_played=True).iterator():
+        for alliance in ('blue', 'red'):
+            for station in (1, 2, 3):
+                key = (match.competition_id, getattr(match, f'{alliance}_team_{station}_id'))
+                played, fuel, auto, climb = totals.get(key, (0, 0, 0, 0))
+                totals[key] = (
+                    played + 1,
+                    fuel + getattr(match, f'{alliance}_{station}_fuel_scored'),
+                    auto + getattr(match, f'{alliance}_{station}_auto_fuel'),
+                    climb + CLIMB_POINTS.get(getattr(match, f'{alliance}_{station}_climb'), 0),
+                )
+
+    team_infos = list(TeamInfo.objects.all())
+    for team_info in team_infos:
+        played, fuel, auto, climb = totals.get((team_info.competition_id, team_info.team_id), (0, 0, 0, 0))
+        team_info.matches_played = played
+        team_info.total_fuel_scored = fuel
+        team_info.total_auto_fuel = auto
+        team_info.total_climb_points = climb
+    TeamInfo.objects.bulk_update(
+        team_infos,
+        ['matches_played', 'total_fuel_scored', 'total_auto_fuel', 'total_climb_points'],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0014_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teaminfo',
+            name='matches_played',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teaminfo',
+            name='total_auto_fuel',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teaminfo',
+            name='total_climb_points',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teaminfo',
+            name='total_fuel_scored',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
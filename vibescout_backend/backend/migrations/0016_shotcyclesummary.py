@@ -0,0 +1,81 @@
+# Generated by Django 6.0.1 on 2026-10-17 18:47
+
+import django.db.models.deletion
+from statistics import median
+from django.db import migrations, models
+
+
+def backfill_summaries(apps, schema_editor):
+    ShotTiming = apps.get_model('backend', 'ShotTiming')
+    ShotCycleSummary = apps.get_model('backend', 'ShotCycleSummary')
+    intervals = {}
+    for match_id, competition_id, team_id, start, end in (
+        ShotTiming.objects.order_by('match_id', 'team_id', 'start_shot_time')
+        .values_list('match_id', 'match__competition_id', 'team_id', 'start_shot_time', 'end_shot_time')
+        .iterator()
+    ):
+        intervals.setdefault((match_id, competition_id, team_id), []).append((start, end))
+
+    summaries = []
+    for (match_id, competition_id, team_id), rows in intervals.items():
+        cycles = []
+        for start, end in rows:
+            if cycles and start <= cycles[-1][1]:
+                cycles[-1][1] = max(cycles[-1][1], end)
+            else:
+                cycles.append([start, end])
+        starts = [start for start, _ in cycles]
+        cycle_times = [b - a for a, b in zip(starts, starts[1:])]
+        gaps = [start - previous_end for (_, previous_end), (start, _) in zip(cycles, cycles[1:])]
+        shooting_time = sum(end - start for start, end in cycles)
+        active_time = cycles[-1][1] - cycles[0][0]
+        summaries.append(ShotCycleSummary(
+            match_id=match_id,
+            team_id=team_id,
+            competition_id=competition_id,
+            shots=len(rows),
+            cycles=len(cycles),
+            shooting_time=shooting_time,
+            active_time=active_time,
+            duty_cycle=shooting_time / active_time if active_time > 0 else 1.0,
+            cycle_time_total=starts[-1] - starts[0],
+            mean_cycle_time=sum(cycle_times) / len(cycle_times) if cycle_times else None,
+            median_cycle_time=median(cycle_times) if cycle_times else None,
+            idle_time=sum(gaps),
+            max_idle_gap=max(gaps, default=0.0),
+        ))
+    ShotCycleSummary.objects.bulk_create(summaries, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0015_teaminfo_running_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShotCycleSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shots', models.IntegerField(default=0)),
+                ('cycles', models.IntegerField(default=0)),
+                ('shooting_time', models.FloatField(default=0.0)),
+                ('active_time', models.FloatField(default=0.0)),
+                ('duty_cycle', models.FloatField(default=0.0)),
+                ('cycle_time_total', models.FloatField(default=0.0)),
+                ('mean_cycle_time', models.FloatField(blank=True, null=True)),
+                ('median_cycle_time', models.FloatField(blank=True, null=True)),
+                ('idle_time', models.FloatField(default=0.0)),
+                ('max_idle_gap', models.FloatField(default=0.0)),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shot_cycle_summaries', to='backend.competition')),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shot_cycle_summaries', to='backend.match')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shot_cycle_summaries', to='backend.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['competition', 'team'], name='backend_sho_competi_923de3_idx'), models.Index(fields=['team', 'competition'], name='backend_sho_team_id_1d6e70_idx')],
+                'unique_together': {('match', 'team')},
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
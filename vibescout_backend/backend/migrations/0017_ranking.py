@@ -0,0 +1,92 @@
+# Generated by Django 6.0.1 on 2026-10-17 18:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_rankings(apps, schema_editor):
+    Team = apps.get_model('backend', 'Team')
+    Match = apps.get_model('backend', 'Match')
+    TeamInfo = apps.get_model('backend', 'TeamInfo')
+    Ranking = apps.get_model('backend', 'Ranking')
+    totals = {}
+    for match in Match.objects.filter(has_played=True, match_type='qualification').iterator():
+        fuel = {'blue': match.total_blue_fuels, 'red': match.total_red_fuels}
+        for alliance, other in (('blue', 'red'), ('red', 'blue')):
+            own, against = fuel[alliance], fuel[other]
+            for station in (1, 2, 3):
+                key = (match.competition_id, getattr(match, f'{alliance}_team_{station}_id'))
+                played, rp, wins, losses, ties, total = totals.get(key, (0, 0, 0, 0, 0, 0))
+                totals[key] = (
+                    played + 1,
+                    rp + (2 if own > against else 1 if own == against else 0),
+                    wins + (own > against),
+                    losses + (own < against),
+                    ties + (own == against),
+                    total + own,
+                )
+
+    team_infos = list(TeamInfo.objects.all())
+    keys = set(totals) | {(team_info.competition_id, team_info.team_id) for team_info in team_infos}
+    team_numbers = dict(Team.objects.values_list('pk', 'number'))
+    rankings = []
+    for competition_id, team_id in keys:
+        played, rp, wins, losses, ties, total = totals.get((competition_id, team_id), (0, 0, 0, 0, 0, 0))
+        rankings.append(Ranking(
+            competition_id=competition_id,
+            team_id=team_id,
+            matches_played=played,
+            ranking_points=rp,
+            average_ranking_points=rp / played if played else 0.0,
+            wins=wins,
+            losses=losses,
+            ties=ties,
+            total_fuel_scored=total,
+        ))
+    rankings.sort(key=lambda r: (r.competition_id, -r.ranking_points, -r.wins, -r.total_fuel_scored, team_numbers[r.team_id]))
+    rank, competition_id = 0, None
+    for ranking in rankings:
+        rank = rank + 1 if ranking.competition_id == competition_id else 1
+        competition_id = ranking.competition_id
+        ranking.rank = rank
+    Ranking.objects.bulk_create(rankings, batch_size=500)
+
+    for team_info in team_infos:
+        _, rp, wins, losses, ties, _ = totals.get((team_info.competition_id, team_info.team_id), (0, 0, 0, 0, 0, 0))
+        team_info.ranking_points = rp
+        team_info.win = wins
+        team_info.lose = losses
+        team_info.tie = ties
+    TeamInfo.objects.bulk_update(team_infos, ['ranking_points', 'win', 'lose', 'tie'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0016_shotcyclesummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Ranking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.IntegerField(default=0)),
+                ('matches_played', models.IntegerField(default=0)),
+                ('ranking_points', models.FloatField(default=0.0)),
+                ('average_ranking_points', models.FloatField(default=0.0)),
+                ('wins', models.IntegerField(default=0)),
+                ('losses', models.IntegerField(default=0)),
+                ('ties', models.IntegerField(default=0)),
+                ('total_fuel_scored', models.IntegerField(default=0)),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rankings', to='backend.competition')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rankings', to='backend.team')),
+            ],
+            options={
+                'ordering': ['competition', 'rank'],
+                'indexes': [models.Index(fields=['competition', 'rank'], name='backend_ran_competi_94b426_idx')],
+                'unique_together': {('competition', 'team')},
+            },
+        ),
+        migrations.RunPython(backfill_rankings, migrations.RunPython.noop),
+    ]
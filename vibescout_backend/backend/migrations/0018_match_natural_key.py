@@ -0,0 +1,51 @@
+# Generated by Django 6.0.1 on 2026-10-17 18:57
+
+from importlib import import_module
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+NATURAL_KEY = ['competition_id', 'match_type', 'set_number', 'match_number']
+
+
+def dedupe_matches(apps, schema_editor):
+    """
+    Keep the newest row of every natural key so the unique constraint can be
+    added, moving shot timings of the dropped rows onto it.
+    """
+    Match = apps.get_model('backend', 'Match')
+    ShotTiming = apps.get_model('backend', 'ShotTiming')
+    groups = list(
+        Match.objects.values(*NATURAL_KEY).annotate(count=Count('id'), keep=Max('id')).filter(count__gt=1)
+    )
+    if not groups:
+        return
+    for group in groups:
+        dropped = Match.objects.filter(**{field: group[field] for field in NATURAL_KEY}).exclude(pk=group['keep'])
+        ShotTiming.objects.filter(match__in=dropped).update(match_id=group['keep'])
+        dropped.delete()
+
+    # The backfills of 0015-0017 counted the duplicates; rebuild their rows from the kept matches
+    apps.get_model('backend', 'ShotCycleSummary').objects.all().delete()
+    apps.get_model('backend', 'Ranking').objects.all().delete()
+    import_module('backend.migrations.0015_teaminfo_running_totals').backfill_totals(apps, schema_editor)
+    import_module('backend.migrations.0016_shotcyclesummary').backfill_summaries(apps, schema_editor)
+    import_module('backend.migrations.0017_ranking').backfill_rankings(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0017_ranking'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_matches, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='match',
+            name='backend_mat_competi_2d66e6_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='match',
+            constraint=models.UniqueConstraint(fields=('competition', 'match_type', 'set_number', 'match_number'), name='unique_match_natural_key'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-17 19:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0018_match_natural_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TbaSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_key', models.CharField(max_length=50, unique=True)),
+                ('etag', models.CharField(blank=True, default='', max_length=255)),
+                ('last_modified', models.CharField(blank=True, default='', max_length=64)),
+                ('match_hashes', models.JSONField(default=dict)),
+                ('synced_at', models.DateTimeField(blank=True, null=True)),
+                ('competition', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='tba_sync_state', to='backend.competition')),
+            ],
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Case, When
 
 
 class Team(models.Model):
@@ -21,6 +22,8 @@ class Competition(models.Model):
     stream_link_day_1 = models.CharField(max_length=255, blank=True, null=True)
     stream_link_day_2 = models.CharField(max_length=255, blank=True, null=True)
     stream_link_day_3 = models.CharField(max_length=255, blank=True, null=True)
+    data_version = models.PositiveIntegerField(default=0) # bumped whenever a Match, TeamInfo or ShotTiming changes
+    data_updated_at = models.DateTimeField(blank=True, null=True)
 
     def __str__(self):
         return self.name
@@ -81,6 +84,14 @@ class TeamInfo(models.Model):
     avg_shuttle = models.FloatField(default=0.0, blank=True, null=True)
     avg_auto_fuel = models.FloatField(default=0.0, blank=True, null=True)
     avg_climb_points = models.FloatField(default=0.0, blank=True, null=True)
+
+    # Running totals over played matches, maintained by backend.analytics.aggregates
+    matches_played = models.IntegerField(default=0)
+    total_fuel_scored = models.IntegerField(default=0)
+    total_auto_fuel = models.IntegerField(default=0)
+    total_climb_points = models.IntegerField(default=0)
+
+    data_version = models.PositiveIntegerField(default=0) # competition data_version of the last change
     
     
     def __str__(self):
@@ -89,6 +100,9 @@ class TeamInfo(models.Model):
     class Meta:
         ordering = ['-ranking_points']
         unique_together = ['team', 'competition']
+        indexes = [
+            models.Index(fields=['competition', 'data_version']),
+        ]
 
 
 class Match(models.Model):
@@ -110,6 +124,18 @@ class Match(models.Model):
     set_number = models.IntegerField(default=1)
     has_played = models.BooleanField(default=False)
     match_type = models.CharField(max_length=20, choices=TYPE_CHOICES, default='Qualification')
+    # Schedule position of match_type, stored so the schedule ordering can use an index
+    match_type_order = models.GeneratedField(
+        expression=Case(
+            When(match_type='qualification', then=1),
+            When(match_type='quarterfinal', then=2),
+            When(match_type='semifinal', then=3),
+            When(match_type='final', then=4),
+            default=5,
+        ),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
     blue_team_1 = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='blue_1_matches')
     blue_team_2 = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='blue_2_matches')
     blue_team_3 = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='blue_3_matches')
@@ -154,6 +180,8 @@ class Match(models.Model):
     red_3_climb = models.CharField(max_length=10, choices=CLIMB_CHOICES, default='None')
     
     calculated_points = models.IntegerField(default=0)
+
+    data_version = models.PositiveIntegerField(default=0) # competition data_version of the last change
     
     def __str__(self):
         return f"Match - {self.competition.name}"
@@ -161,6 +189,42 @@ class Match(models.Model):
     class Meta:
         ordering = ['-id']
         verbose_name_plural = 'Matches'
+        indexes = [
+            models.Index(fields=['competition', 'data_version']),
+            models.Index(fields=['competition', 'match_type_order', 'match_number']),
+            models.Index(fields=['competition', 'start_match_time']),
+        ]
+        constraints = [
+            # Natural key of a match, used by the bulk import upsert
+            models.UniqueConstraint(
+                fields=['competition', 'match_type', 'set_number', 'match_number'],
+                name='unique_match_natural_key',
+            ),
+        ]
+
+
+class MatchParticipant(models.Model):
+    """One row per team slot of a Match, kept in sync with it for per-team lookups"""
+    ALLIANCE_CHOICES = [
+        ('blue', 'Blue'),
+        ('red', 'Red'),
+    ]
+
+    match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name='participants')
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='participations')
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, related_name='participants')
+    alliance = models.CharField(max_length=4, choices=ALLIANCE_CHOICES)
+    station = models.PositiveSmallIntegerField() # 1-3, matches the blue_team_N/red_team_N slot
+
+    def __str__(self):
+        return f"Team {self.team_id} - {self.alliance} {self.station} in match {self.match_id}"
+
+    class Meta:
+        ordering = ['match', 'alliance', 'station']
+        unique_together = ['match', 'alliance', 'station']
+        indexes = [
+            models.Index(fields=['team', 'competition']),
+        ]
 
 
 class ShotTiming(models.Model):
@@ -168,9 +232,111 @@ class ShotTiming(models.Model):
     team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='shot_timings')
     start_shot_time = models.FloatField()
     end_shot_time = models.FloatField()
+    data_version = models.PositiveIntegerField(default=0, db_index=True) # competition data_version of the last change
+    idempotency_key = models.CharField(max_length=64, unique=True, blank=True, null=True) # client-supplied, dedupes retried uploads
     
     def __str__(self):
         return f"Team {self.team.number} - Match {self.match.match_number}: {self.start_shot_time}s - {self.end_shot_time}s"
     
     class Meta:
         ordering = ['match', 'start_shot_time']
+        indexes = [
+            models.Index(fields=['match', 'team', 'start_shot_time']),
+        ]
+
+
+class Ranking(models.Model):
+    """
+    Qualification standing of a team at a competition, kept current as match
+    results land. Maintained by backend.analytics.rankings.
+    """
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, related_name='rankings')
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='rankings')
+    rank = models.IntegerField(default=0)
+    matches_played = models.IntegerField(default=0) # played qualification matches
+    ranking_points = models.FloatField(default=0.0)
+    average_ranking_points = models.FloatField(default=0.0)
+    wins = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    ties = models.IntegerField(default=0)
+    total_fuel_scored = models.IntegerField(default=0) # tiebreaker, alliance fuel over qualification matches
+
+    def __str__(self):
+        return f"{self.rank}. {self.team} - {self.ranking_points} RP"
+
+    class Meta:
+        ordering = ['competition', 'rank']
+        unique_together = ['competition', 'team']
+        indexes = [
+            models.Index(fields=['competition', 'rank']),
+        ]
+
+
+class ShotCycleSummary(models.Model):
+    """
+    Shooting cycles of one team in one match, derived from its ShotTiming
+    intervals. Maintained by backend.analytics.shot_cycles.
+    """
+    match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name='shot_cycle_summaries')
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='shot_cycle_summaries')
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, related_name='shot_cycle_summaries')
+    shots = models.IntegerField(default=0) # raw ShotTiming intervals
+    cycles = models.IntegerField(default=0) # intervals after merging overlaps
+    shooting_time = models.FloatField(default=0.0) # in seconds, union of the intervals
+    active_time = models.FloatField(default=0.0) # in seconds, first start to last end
+    duty_cycle = models.FloatField(default=0.0) # shooting_time / active_time
+    cycle_time_total = models.FloatField(default=0.0) # in seconds, first cycle start to last cycle start
+    mean_cycle_time = models.FloatField(null=True, blank=True) # in seconds, start to start
+    median_cycle_time = models.FloatField(null=True, blank=True) # in seconds, start to start
+    idle_time = models.FloatField(default=0.0) # in seconds, sum of gaps between cycles
+    max_idle_gap = models.FloatField(default=0.0) # in seconds
+
+    def __str__(self):
+        return f"Team {self.team.number} - Match {self.match.match_number}: {self.cycles} cycles"
+
+    class Meta:
+        unique_together = ['match', 'team']
+        indexes = [
+            models.Index(fields=['competition', 'team']),
+            models.Index(fields=['team', 'competition']),
+        ]
+
+
+class DeletedRecord(models.Model):
+    """Tombstone for a deleted row so delta-sync clients can drop their copy"""
+    MODEL_CHOICES = [
+        ('match', 'Match'),
+        ('team_info', 'Team Info'),
+        ('shot_timing', 'Shot Timing'),
+    ]
+
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, related_name='deleted_records')
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    key = models.JSONField() # natural key the client stores the row under
+    data_version = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.model} {self.key} @ {self.data_version}"
+
+    class Meta:
+        ordering = ['data_version']
+        indexes = [
+            models.Index(fields=['competition', 'data_version']),
+        ]
+
+
+class TbaSyncState(models.Model):
+    """
+    Upstream validators and per-match payload hashes of the last TBA sync of
+    an event, so a re-sync can send conditional requests and write only the
+    matches whose payload changed. Maintained by backend.tba_sync.
+    """
+    event_key = models.CharField(max_length=50, unique=True)
+    competition = models.OneToOneField(Competition, on_delete=models.CASCADE, related_name='tba_sync_state')
+    etag = models.CharField(max_length=255, blank=True, default='')
+    last_modified = models.CharField(max_length=64, blank=True, default='') # HTTP date, sent back verbatim
+    match_hashes = models.JSONField(default=dict) # TBA match key -> sha256 of its payload
+    synced_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.event_key} @ {self.synced_at}"
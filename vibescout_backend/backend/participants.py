@@ -0,0 +1,33 @@
+from django.db import transaction
+from .models import MatchParticipant
+
+SLOTS = [
+    ('blue', 1), ('blue', 2), ('blue', 3),
+    ('red', 1), ('red', 2), ('red', 3),
+]
+
+
+def participant_rows(match):
+    return [
+        MatchParticipant(
+            match_id=match.pk,
+            team_id=getattr(match, f'{alliance}_team_{station}_id'),
+            competition_id=match.competition_id,
+            alliance=alliance,
+            station=station,
+        )
+        for alliance, station in SLOTS
+    ]
+
+
+def sync_participants(matches):
+    """
+    Rebuild the participant rows of saved matches. Called from the Match
+    post_save signal and by bulk writers, which bypass it.
+    """
+    matches = list(matches)
+    if not matches:
+        return
+    with transaction.atomic():
+        MatchParticipant.objects.filter(match_id__in=[match.pk for match in matches]).delete()
+        MatchParticipant.objects.bulk_create([row for match in matches for row in participant_rows(match)])
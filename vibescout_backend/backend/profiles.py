@@ -0,0 +1,80 @@
+from django.db.models import Count, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, NullIf
+from .models import Competition, Ranking, TeamInfo
+
+# Season average -> running total it is weighted from
+SEASON_AVERAGES = {
+    'avg_fuel_scored': 'total_fuel_scored',
+    'avg_auto_fuel': 'total_auto_fuel',
+    'avg_climb_points': 'total_climb_points',
+}
+
+
+def _weighted_average(total_field):
+    return Cast(Sum(total_field), FloatField()) / NullIf(Sum('matches_played'), 0)
+
+
+def season_aggregates(teams):
+    """
+    team_id -> season aggregates over every TeamInfo row of the teams, in one
+    grouped query. Averages are weighted by all matches played at each event;
+    W-L-T and qualification_matches count qualification matches only. The
+    best event is the one with the best qualification rank among events where
+    the team has played a qualification match (before that, ranks only follow
+    team numbers).
+    """
+    best = Ranking.objects.filter(team_id=OuterRef('team_id'), matches_played__gt=0).order_by(
+        'rank', '-average_ranking_points', 'competition__code'
+    )
+    rows = (
+        TeamInfo.objects.filter(team__in=teams)
+        .values('team_id')
+        # The averages refer to the matches_played column, so they are annotated before it is shadowed
+        .annotate(**{average: _weighted_average(total) for average, total in SEASON_AVERAGES.items()})
+        .annotate(
+            events=Count('id'),
+            matches_played=Sum('matches_played'),
+            wins=Sum('win'),
+            losses=Sum('lose'),
+            ties=Sum('tie'),
+            ranking_points=Sum('ranking_points'),
+            best_event_code=Subquery(best.values('competition__code')[:1]),
+            best_rank=Subquery(best.values('rank')[:1]),
+        )
+        .order_by()
+    )
+    aggregates = {}
+    for row in rows:
+        team_id = row.pop('team_id')
+        for average in SEASON_AVERAGES:
+            row[average] = row[average] or 0.0
+        row['qualification_matches'] = row['wins'] + row['losses'] + row['ties']
+        aggregates[team_id] = row
+    return aggregates
+
+
+def team_profiles(teams):
+    """Season profile of each team: its per-event TeamInfo rows and season aggregates, in two queries"""
+    events = {}
+    for team_info in (
+        TeamInfo.objects.select_related('team', 'competition')
+        .filter(team__in=teams)
+        .order_by('team_id', 'competition__name')
+    ):
+        events.setdefault(team_info.team_id, []).append(team_info)
+    aggregates = season_aggregates(teams)
+    empty = {
+        'events': 0, 'matches_played': 0, 'qualification_matches': 0, 'wins': 0, 'losses': 0, 'ties': 0, 'ranking_points': 0.0,
+        'best_event_code': None, 'best_rank': None, **{average: 0.0 for average in SEASON_AVERAGES},
+    }
+    return [
+        {'team': team, 'season': aggregates.get(team.pk, empty), 'events': events.get(team.pk, [])}
+        for team in teams
+    ]
+
+
+def profile_versions(teams):
+    """(competition id, data version) of every competition the teams attended"""
+    return list(
+        Competition.objects.filter(results__team__in=teams).distinct().order_by('pk').values_list('pk', 'data_version')
+    )
@@ -0,0 +1,23 @@
+from .models import Match, MatchParticipant
+
+
+def with_teams(matches):
+    return matches.select_related(
+        'competition', 'blue_team_1', 'blue_team_2', 'blue_team_3',
+        'red_team_1', 'red_team_2', 'red_team_3'
+    )
+
+
+def competition_matches(competition):
+    """Matches of a competition in schedule order with teams and competition joined"""
+    return with_teams(Match.objects.filter(competition=competition)).order_by('match_type_order', 'match_number')
+
+
+def team_matches(team, competition=None):
+    """Matches a team played in, resolved through the indexed participant table"""
+    participations = MatchParticipant.objects.filter(team=team)
+    if competition is not None:
+        participations = participations.filter(competition=competition)
+    return with_teams(Match.objects.filter(id__in=participations.values('match_id'))).order_by(
+        'competition__name', 'match_type_order', 'match_number'
+    )
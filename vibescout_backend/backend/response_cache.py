@@ -0,0 +1,116 @@
+import hashlib
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from pydantic import TypeAdapter
+
+# Every cached response depends on one or more scopes. Each scope has a
+# generation token in the cache; invalidating a scope replaces its token,
+# which orphans every key built from the old one.
+COMPETITIONS_SCOPE = 'competitions'
+
+
+def competition_scope(competition_id):
+    return f'competition:{competition_id}'
+
+
+def team_scope(team_id):
+    return f'team:{team_id}'
+
+
+def _generation_key(scope):
+    return f'vibescout:gen:{scope}'
+
+
+def get_generations(scopes):
+    keys = [_generation_key(scope) for scope in scopes]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            # A fresh token (rather than 0) so an evicted generation can never
+            # resurrect responses cached under an older one
+            cache.add(key, uuid.uuid4().hex, None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+async def aget_generations(scopes):
+    keys = [_generation_key(scope) for scope in scopes]
+    generations = await cache.aget_many(keys)
+    for key in keys:
+        if key not in generations:
+            await cache.aadd(key, uuid.uuid4().hex, None)
+            generations[key] = await cache.aget(key)
+    return [generations[key] for key in keys]
+
+
+def invalidate(*scopes):
+    cache.set_many({_generation_key(scope): uuid.uuid4().hex for scope in scopes}, None)
+
+
+def make_key(key_parts, generations):
+    raw = ':'.join(str(part) for part in (*key_parts, *generations))
+    return 'vibescout:response:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def _version_key(name, competition, params):
+    return make_key((name, competition.pk, competition.data_version, *params), [])
+
+
+def cached_by_version(name, competition, build, *params):
+    """
+    Cache a computed value (e.g. analytics results) for the competition's
+    current data version; any Match/TeamInfo/ShotTiming change moves to a new key.
+    """
+    key = _version_key(name, competition, params)
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, settings.RESPONSE_CACHE_TIMEOUT)
+    return value
+
+
+def cache_is_shared():
+    """False for process-local backends, where a value stored by one process is invisible to the others"""
+    return not isinstance(cache, (LocMemCache, DummyCache))
+
+
+def prime_by_version(name, competition, value, *params):
+    """Store a value computed elsewhere (e.g. by a batch job) for the competition's current data version"""
+    cache.set(_version_key(name, competition, params), value, settings.RESPONSE_CACHE_TIMEOUT)
+
+
+def serialize(schema, data):
+    """Validate ORM data against a response schema and render it to JSON bytes"""
+    adapter = TypeAdapter(schema)
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def cached_json(response, key_parts, scopes, build):
+    """
+    Serve a JSON body from the cache, calling `build` to produce it on a miss.
+    The body is written into the temporal response so headers set earlier
+    (ETag, Last-Modified) are preserved.
+    """
+    key = make_key(key_parts, get_generations(scopes))
+    body = cache.get(key)
+    if body is None:
+        body = build()
+        cache.set(key, body, settings.RESPONSE_CACHE_TIMEOUT)
+    response.content = body
+    response['Content-Type'] = 'application/json; charset=utf-8'
+    return response
+
+
+async def acached_json(response, key_parts, scopes, build):
+    """Async variant of cached_json; `build` is a coroutine function"""
+    key = make_key(key_parts, await aget_generations(scopes))
+    body = await cache.aget(key)
+    if body is None:
+        body = await build()
+        await cache.aset(key, body, settings.RESPONSE_CACHE_TIMEOUT)
+    response.content = body
+    response['Content-Type'] = 'application/json; charset=utf-8'
+    return response
@@ -1,6 +1,6 @@
 from ninja import Schema, ModelSchema
-from typing import Optional
-from .models import Team, Competition, TeamInfo, Match, ShotTiming
+from typing import Optional, List, Union, Dict
+from .models import Team, Competition, TeamInfo, Match, ShotTiming, Ranking, ShotCycleSummary, DeletedRecord
 
 
 class TeamSchema(ModelSchema):
@@ -53,6 +53,21 @@ class PrescouttingUpdateSchema(Schema):
     prescout_additional_comments: Optional[str] = None
 
 
+class PrescoutingBulkItemSchema(PrescouttingUpdateSchema):
+    team_number: int
+
+
+class BulkItemErrorSchema(Schema):
+    index: int
+    team_number: Optional[int] = None
+    detail: str
+
+
+class PrescoutingBulkResultSchema(Schema):
+    updated: List[TeamInfoSchema]
+    errors: List[BulkItemErrorSchema]
+
+
 class MatchSchema(ModelSchema):
     blue_team_1: TeamSchema
     blue_team_2: TeamSchema
@@ -92,3 +107,240 @@ class ShotTimingSchema(ModelSchema):
 class ShotTimingCreateSchema(Schema):
     start_shot_time: float
     end_shot_time: float
+
+
+class ShotTimingSyncSchema(ModelSchema):
+    team: TeamSchema
+    match_type: str
+    set_number: int
+    match_number: int
+
+    class Meta:
+        model = ShotTiming
+        fields = ['id', 'team', 'start_shot_time', 'end_shot_time']
+
+    @staticmethod
+    def resolve_match_type(obj):
+        return obj.match.match_type
+
+    @staticmethod
+    def resolve_set_number(obj):
+        return obj.match.set_number
+
+    @staticmethod
+    def resolve_match_number(obj):
+        return obj.match.match_number
+
+
+class DeletedRecordSchema(ModelSchema):
+    class Meta:
+        model = DeletedRecord
+        fields = ['model', 'key', 'data_version']
+
+
+class CompetitionSyncSchema(Schema):
+    version: int
+    matches: List[MatchSchema]
+    team_info: List[TeamInfoSchema]
+    shot_timings: List[ShotTimingSyncSchema]
+    deleted: List[DeletedRecordSchema]
+
+
+class CompactMatchListSchema(Schema):
+    competition: CompetitionSchema
+    teams: List[TeamSchema]
+    fields: List[str]
+    matches: List[List[Union[bool, int, str]]]
+
+
+class ShotTimingBatchItemSchema(ShotTimingCreateSchema):
+    match_number: int
+    match_type: str = 'qualification'
+    set_number: int = 1
+    team_number: int
+    idempotency_key: Optional[str] = None
+
+
+class ShotTimingBatchResultSchema(Schema):
+    created: int
+    duplicates: int
+    errors: List[BulkItemErrorSchema]
+
+
+class TeamContributionSchema(Schema):
+    team_number: int
+    opr: Dict[str, float]
+    dpr: Dict[str, float]
+    ccwm: Dict[str, float]
+
+
+class ContributionsSchema(Schema):
+    metrics: List[str]
+    matches: int
+    teams: List[TeamContributionSchema]
+
+
+class MatchPredictionSchema(Schema):
+    match_type: str
+    set_number: int
+    match_number: int
+    predicted_match_time: int
+    blue_teams: List[int]
+    red_teams: List[int]
+    blue_win_probability: float
+    red_win_probability: float
+    expected_blue_fuel: float
+    expected_red_fuel: float
+    expected_blue_points: float
+    expected_red_points: float
+
+
+class RankingPointProbabilitySchema(Schema):
+    ranking_points: float
+    probability: float
+
+
+class TeamRankProjectionSchema(Schema):
+    team_number: int
+    current_ranking_points: float
+    expected_ranking_points: float
+    expected_rank: float
+    rank_probabilities: List[float]  # index 0 is the probability of finishing first
+    ranking_point_distribution: List[RankingPointProbabilitySchema]
+
+
+class RankProjectionSchema(Schema):
+    simulations: int
+    remaining_matches: int
+    teams: List[TeamRankProjectionSchema]
+
+
+class ShotCycleSummarySchema(ModelSchema):
+    competition_code: str
+    match_type: str
+    set_number: int
+    match_number: int
+
+    class Meta:
+        model = ShotCycleSummary
+        fields = [
+            'shots', 'cycles', 'shooting_time', 'active_time', 'duty_cycle',
+            'mean_cycle_time', 'median_cycle_time', 'idle_time', 'max_idle_gap',
+        ]
+
+    @staticmethod
+    def resolve_competition_code(obj):
+        return obj.competition.code
+
+    @staticmethod
+    def resolve_match_type(obj):
+        return obj.match.match_type
+
+    @staticmethod
+    def resolve_set_number(obj):
+        return obj.match.set_number
+
+    @staticmethod
+    def resolve_match_number(obj):
+        return obj.match.match_number
+
+
+class TeamShotCycleSchema(Schema):
+    team_number: int
+    matches: int
+    shots: int
+    cycles: int
+    cycles_per_match: float
+    duty_cycle: float
+    mean_cycle_time: Optional[float]
+    mean_idle_gap: Optional[float]
+    max_idle_gap: float
+
+
+class RankingSchema(ModelSchema):
+    team: TeamSchema
+
+    class Meta:
+        model = Ranking
+        fields = [
+            'rank', 'team', 'matches_played', 'ranking_points', 'average_ranking_points',
+            'wins', 'losses', 'ties', 'total_fuel_scored',
+        ]
+
+
+class TeamSeasonSchema(Schema):
+    events: int
+    matches_played: int  # all played matches, playoffs included
+    qualification_matches: int  # wins + losses + ties
+    wins: int
+    losses: int
+    ties: int
+    ranking_points: float
+    avg_fuel_scored: float
+    avg_auto_fuel: float
+    avg_climb_points: float
+    best_event_code: Optional[str]
+    best_rank: Optional[int]
+
+
+class TeamProfileSchema(Schema):
+    team: TeamSchema
+    season: TeamSeasonSchema
+    events: List[TeamInfoSchema]
+
+
+class PickSchema(Schema):
+    team_number: int
+    value: float  # value added to the alliance
+    metrics: Dict[str, float]
+
+
+class AllianceCandidateSchema(Schema):
+    team_numbers: List[int]
+    value: float
+
+
+class PickListSchema(Schema):
+    metrics: List[str]
+    picks: List[PickSchema]
+    alliances: List[AllianceCandidateSchema]
+
+
+class TeamScheduleSchema(Schema):
+    team_number: int
+    matches: int
+    strength: float  # fuel OPR
+    mean_partner_strength: float
+    mean_opponent_strength: float
+    strength_of_schedule: float  # opponent minus partner strength, higher is harder
+    max_partner_repeats: int
+    max_opponent_repeats: int
+
+
+class ScheduleAnalysisSchema(Schema):
+    team_numbers: List[int]
+    partners: List[List[int]]  # rows and columns follow team_numbers
+    opponents: List[List[int]]
+    teams: List[TeamScheduleSchema]
+
+
+class HistogramSchema(Schema):
+    edges: List[float]
+    counts: List[int]
+
+
+class TeamPercentileSchema(Schema):
+    team_number: int
+    value: float
+    percentile_rank: float
+
+
+class MetricDistributionSchema(Schema):
+    metric: str
+    source: str
+    count: int
+    mean: Optional[float]
+    std: Optional[float]
+    percentiles: Dict[str, float]
+    histogram: HistogramSchema
+    teams: List[TeamPercentileSchema]
@@ -89,6 +89,27 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Serialized API responses are cached here. Swap the backend for
+# FileBasedCache/Redis when running several worker processes.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'vibescout',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    }
+}
+
+RESPONSE_CACHE_TIMEOUT = 60 * 60  # in seconds; entries are also invalidated on writes
+
+# Processes in the shared pool that runs rank-projection simulations; 1 runs them in the request process
+PROJECTION_WORKERS = int(os.environ.get('PROJECTION_WORKERS', min(4, os.cpu_count() or 1)))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -0,0 +1,183 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from .models import Team, Competition, TeamInfo, Match, MatchParticipant, ShotTiming
+from .analytics.aggregates import previous_row, stat_row, apply_match_change, recompute_competition
+from .analytics.rankings import apply_match_result_change, ensure_ranking, remove_ranking, recompute_rankings
+from .analytics.shot_cycles import refresh_summaries
+from .participants import sync_participants
+from .versioning import (
+    bump_data_version, stamp_data_version, stamp_team_change, record_deletion, is_competition_cascade, is_team_cascade,
+)
+from .response_cache import COMPETITIONS_SCOPE, competition_scope, team_scope, invalidate
+
+
+@receiver(post_save, sender=Match)
+@receiver(post_save, sender=TeamInfo)
+def stamp_competition_row(sender, instance, **kwargs):
+    stamp_data_version(instance, instance.competition_id)
+
+
+@receiver(post_save, sender=Match)
+def sync_match_participants(sender, instance, **kwargs):
+    sync_participants([instance])
+
+
+@receiver(pre_save, sender=Match)
+def snapshot_match_stats(sender, instance, **kwargs):
+    instance._previous_stats = previous_row(instance)
+
+
+@receiver(post_save, sender=Match)
+def update_team_aggregates(sender, instance, **kwargs):
+    apply_match_change(getattr(instance, '_previous_stats', None), stat_row(instance))
+
+
+@receiver(post_delete, sender=Match)
+def remove_team_aggregates(sender, instance, origin=None, **kwargs):
+    # A deleted team's matches are accounted for by rebuild_after_team_delete
+    if is_competition_cascade(origin) or is_team_cascade(origin):
+        return
+    apply_match_change(stat_row(instance), None)
+
+
+@receiver(post_save, sender=Match)
+def update_rankings(sender, instance, **kwargs):
+    apply_match_result_change(getattr(instance, '_previous_stats', None), stat_row(instance))
+
+
+@receiver(post_delete, sender=Match)
+def remove_match_results(sender, instance, origin=None, **kwargs):
+    if is_competition_cascade(origin) or is_team_cascade(origin):
+        return
+    apply_match_result_change(stat_row(instance), None)
+
+
+@receiver(pre_delete, sender=Team)
+def rebuild_after_team_delete(sender, instance, **kwargs):
+    """
+    Deleting a team cascades to every match it played, which changes the
+    stats of the other teams in them. Applying those per match while the
+    team's own rows are being deleted would write to rows about to vanish,
+    so each affected competition is rebuilt once the delete has committed.
+    """
+    competition_ids = set(
+        MatchParticipant.objects.filter(team=instance).values_list('competition_id', flat=True).distinct()
+    )
+
+    def rebuild():
+        for competition_id in competition_ids:
+            recompute_competition(competition_id)
+            recompute_rankings(competition_id)
+
+    transaction.on_commit(rebuild)
+
+
+@receiver(post_save, sender=TeamInfo)
+def create_ranking(sender, instance, created, **kwargs):
+    if created:
+        ensure_ranking(instance.competition_id, instance.team_id)
+
+
+@receiver(post_delete, sender=TeamInfo)
+def delete_ranking(sender, instance, origin=None, **kwargs):
+    if is_competition_cascade(origin):
+        return
+    remove_ranking(instance.competition_id, instance.team_id)
+
+
+@receiver(post_save, sender=ShotTiming)
+def stamp_shot_timing(sender, instance, **kwargs):
+    stamp_data_version(instance, instance.match.competition_id)
+
+
+@receiver(pre_save, sender=ShotTiming)
+def snapshot_shot_timing_pair(sender, instance, **kwargs):
+    instance._previous_pair = (
+        ShotTiming.objects.filter(pk=instance.pk).values_list('match_id', 'team_id').first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=ShotTiming)
+def refresh_shot_cycles(sender, instance, **kwargs):
+    pairs = {(instance.match_id, instance.team_id)}
+    if getattr(instance, '_previous_pair', None):
+        pairs.add(instance._previous_pair)
+    refresh_summaries(pairs)
+
+
+@receiver(post_delete, sender=ShotTiming)
+def remove_shot_cycles(sender, instance, origin=None, **kwargs):
+    # Summaries of a deleted match, team or competition cascade with it
+    if not (isinstance(origin, ShotTiming) or (isinstance(origin, QuerySet) and origin.model is ShotTiming)):
+        return
+    refresh_summaries({(instance.match_id, instance.team_id)})
+
+
+@receiver(post_delete, sender=Match)
+def record_match_deletion(sender, instance, origin=None, **kwargs):
+    if is_competition_cascade(origin):
+        return
+    record_deletion(instance.competition_id, 'match', {
+        'match_type': instance.match_type,
+        'set_number': instance.set_number,
+        'match_number': instance.match_number,
+    })
+
+
+@receiver(post_delete, sender=TeamInfo)
+def record_team_info_deletion(sender, instance, origin=None, **kwargs):
+    if is_competition_cascade(origin):
+        return
+    record_deletion(instance.competition_id, 'team_info', {'team_number': instance.team.number})
+
+
+@receiver(post_delete, sender=ShotTiming)
+def record_shot_timing_deletion(sender, instance, origin=None, **kwargs):
+    if is_competition_cascade(origin):
+        return
+    record_deletion(instance.match.competition_id, 'shot_timing', {'id': instance.pk})
+
+
+# Match and TeamInfo changes bump the competition data version, which is part
+# of the ETag and of every competition-scoped cache key. Teams and
+# competitions are embedded in those responses too, so editing one bumps the
+# versions it appears under, and the receivers below also invalidate the
+# responses cached by scope alone.
+
+@receiver(pre_save, sender=Competition)
+def keep_competition_version(sender, instance, **kwargs):
+    # An instance loaded before later match writes must not save its stale data_version back
+    if instance.pk:
+        current = Competition.objects.filter(pk=instance.pk).values_list('data_version', flat=True).first()
+        instance.data_version = max(instance.data_version, current or 0)
+
+
+@receiver(post_save, sender=Competition)
+def bump_competition_version(sender, instance, **kwargs):
+    instance.data_version = bump_data_version(instance.pk)
+
+
+@receiver(post_save, sender=Competition)
+@receiver(post_delete, sender=Competition)
+def invalidate_competition_responses(sender, instance, **kwargs):
+    invalidate(COMPETITIONS_SCOPE, competition_scope(instance.pk))
+
+
+@receiver(post_save, sender=Team)
+def invalidate_team_responses(sender, instance, **kwargs):
+    competition_ids = stamp_team_change(instance.pk)
+    invalidate(team_scope(instance.pk), *(competition_scope(pk) for pk in competition_ids))
+
+
+@receiver(post_delete, sender=Team)
+def invalidate_deleted_team_responses(sender, instance, **kwargs):
+    invalidate(team_scope(instance.pk))
+
+
+@receiver(post_save, sender=TeamInfo)
+@receiver(post_delete, sender=TeamInfo)
+def invalidate_team_info_responses(sender, instance, **kwargs):
+    invalidate(team_scope(instance.team_id))
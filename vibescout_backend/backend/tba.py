@@ -0,0 +1,251 @@
+"""
+Mapping of The Blue Alliance match data onto Match rows, and the bulk write
+path shared by the TBA import commands.
+"""
+import re
+from django.db import transaction
+from .models import Team, Match, TeamInfo, Ranking
+from .analytics.aggregates import (
+    STAT_FIELDS, stat_row, match_contributions, combined_contributions, contribution_deltas,
+    apply_deltas, recompute_competition,
+)
+from .analytics.rankings import RESULT_FIELDS, match_results, apply_result_deltas, rerank, recompute_rankings
+from .participants import SLOTS, sync_participants
+from .response_cache import invalidate, team_scope
+from .versioning import stamp_bulk_data_version
+
+MATCH_TYPE_MAP = {
+    'qm': 'qualification',
+    'qf': 'quarterfinal',
+    'sf': 'semifinal',
+    'f': 'final',
+}
+
+NATURAL_KEY = ['competition', 'match_type', 'set_number', 'match_number']
+
+TEAM_SLOTS = [f'{alliance}_team_{station}' for alliance, station in SLOTS]
+
+
+def map_climb(endgame_value, year):
+    """Map a TBA endgame value onto our climb levels based on the game year"""
+    if year == 2020:
+        # 2020: Park->L1, Hang->L3
+        if endgame_value == 'Park':
+            return 'L1'
+        elif endgame_value == 'Hang':
+            return 'L3'
+    elif year == 2025:
+        # 2025: Map based on actual endgame values
+        # Adjust these mappings based on 2025 game manual
+        if endgame_value in ['Shallow', 'Park']:
+            return 'L1'
+        elif endgame_value == 'Deep':
+            return 'L2'
+        elif endgame_value in ['Cage', 'High']:
+            return 'L3'
+    return 'None'
+
+
+def map_match(match_data):
+    """
+    Match field values for one TBA match, with team numbers in the team
+    slots, or None when the match does not list three teams per alliance.
+    """
+    alliances = match_data.get('alliances', {})
+    blue_alliance = alliances.get('blue', {})
+    red_alliance = alliances.get('red', {})
+
+    blue_team_keys = blue_alliance.get('team_keys', [])
+    red_team_keys = red_alliance.get('team_keys', [])
+
+    if len(blue_team_keys) < 3 or len(red_team_keys) < 3:
+        return None
+
+    tba_key = match_data.get('key', '')
+
+    # Determine match type from TBA comp_level
+    comp_level = match_data.get('comp_level', 'qm')
+    match_type = MATCH_TYPE_MAP.get(comp_level, 'qualification')
+
+    # Extract set_number from TBA key (e.g., qf1m1 -> set 1, qf2m1 -> set 2)
+    # For qualification matches, set_number is always 1
+    set_number = 1
+    if comp_level in ['qf', 'sf', 'f']:
+        # Match pattern like 'qf1', 'sf2', 'f1' in the key
+        match_pattern = re.search(r'_(' + comp_level + r')(\d+)m', tba_key)
+        if match_pattern:
+            set_number = int(match_pattern.group(2))
+
+    score_breakdown = match_data.get('score_breakdown') or {}
+    blue_breakdown = score_breakdown.get('blue', {})
+    red_breakdown = score_breakdown.get('red', {})
+
+    blue_score = blue_alliance.get('score', 0) or 0
+    red_score = red_alliance.get('score', 0) or 0
+    # TBA reports a score of -1 for matches that have not been played yet
+    has_played = blue_score >= 0 and red_score >= 0 and blue_alliance.get('score') is not None
+
+    # Extract year from event key to determine game-specific scoring
+    year = int(tba_key[:4])
+
+    # Initialize scoring variables
+    total_blue_fuels = 0
+    total_red_fuels = 0
+
+    if year == 2020:
+        # 2020 Infinite Recharge scoring
+        blue_auto_cells = (
+            blue_breakdown.get('autoCellsBottom', 0) +
+            blue_breakdown.get('autoCellsOuter', 0) +
+            blue_breakdown.get('autoCellsInner', 0)
+        )
+        red_auto_cells = (
+            red_breakdown.get('autoCellsBottom', 0) +
+            red_breakdown.get('autoCellsOuter', 0) +
+            red_breakdown.get('autoCellsInner', 0)
+        )
+
+        blue_teleop_cells = (
+            blue_breakdown.get('teleopCellsBottom', 0) +
+            blue_breakdown.get('teleopCellsOuter', 0) +
+            blue_breakdown.get('teleopCellsInner', 0)
+        )
+        red_teleop_cells = (
+            red_breakdown.get('teleopCellsBottom', 0) +
+            red_breakdown.get('teleopCellsOuter', 0) +
+            red_breakdown.get('teleopCellsInner', 0)
+        )
+
+        total_blue_fuels = blue_auto_cells + blue_teleop_cells
+        total_red_fuels = red_auto_cells + red_teleop_cells
+    elif year == 2025:
+        # 2025 Reefscape scoring - adapt based on actual game pieces
+        # For now, use generic scoring from breakdown if available
+        # You may need to adjust these field names based on actual 2025 API structure
+        blue_auto_cells = blue_breakdown.get('autoGamePieceCount', 0)
+        red_auto_cells = red_breakdown.get('autoGamePieceCount', 0)
+        blue_teleop_cells = blue_breakdown.get('teleopGamePieceCount', 0)
+        red_teleop_cells = red_breakdown.get('teleopGamePieceCount', 0)
+        total_blue_fuels = blue_auto_cells + blue_teleop_cells
+        total_red_fuels = red_auto_cells + red_teleop_cells
+
+    blue_numbers = [int(key.replace('frc', '')) for key in blue_team_keys[:3]]
+    red_numbers = [int(key.replace('frc', '')) for key in red_team_keys[:3]]
+
+    return {
+        'match_type': match_type,
+        'set_number': set_number,
+        'match_number': match_data.get('match_number', 0),
+        'has_played': has_played,
+        # Extract time fields from TBA API
+        'predicted_match_time': match_data.get('predicted_time', 0) or 0,
+        'start_match_time': match_data.get('actual_time', 0) or 0,
+        'end_match_time': match_data.get('post_result_time', 0) or 0,
+        **dict(zip(TEAM_SLOTS, blue_numbers + red_numbers)),
+        'total_points': blue_score + red_score,
+        'total_blue_fuels': total_blue_fuels,
+        'total_red_fuels': total_red_fuels,
+        'blue_1_climb': map_climb(blue_breakdown.get('endgameRobot1', 'None'), year),
+        'blue_2_climb': map_climb(blue_breakdown.get('endgameRobot2', 'None'), year),
+        'blue_3_climb': map_climb(blue_breakdown.get('endgameRobot3', 'None'), year),
+        'red_1_climb': map_climb(red_breakdown.get('endgameRobot1', 'None'), year),
+        'red_2_climb': map_climb(red_breakdown.get('endgameRobot2', 'None'), year),
+        'red_3_climb': map_climb(red_breakdown.get('endgameRobot3', 'None'), year),
+        'calculated_points': blue_score + red_score,
+    }
+
+
+def team_ids(numbers):
+    """team number -> id for every number, creating missing teams, in at most three queries"""
+    numbers = set(numbers)
+    ids = dict(Team.objects.filter(number__in=numbers).values_list('number', 'id'))
+    missing = numbers - ids.keys()
+    if missing:
+        Team.objects.bulk_create(
+            [Team(number=number, name=f'Team {number}') for number in sorted(missing)],
+            ignore_conflicts=True,
+        )
+        ids = dict(Team.objects.filter(number__in=numbers).values_list('number', 'id'))
+    return ids
+
+
+def upsert_matches(competition, rows, incremental=False):
+    """
+    Write mapped match rows for one competition with a constant number of
+    queries: teams, matches (one upsert on the natural key) and TeamInfo are
+    bulk written, then everything the Match/TeamInfo signals would have kept
+    current (participants, aggregates, rankings, data version, cached team
+    responses) is refreshed explicitly.
+
+    A full import rebuilds the competition's aggregates and rankings; an
+    incremental write (a sync of a few changed matches) applies only the
+    difference between the old and new versions of the written matches.
+    Returns (created, updated) match counts.
+    """
+    # A TBA key listed twice would make the upsert touch one row twice
+    rows = list({tuple(row[field] for field in NATURAL_KEY[1:]): row for row in rows}.values())
+    if not rows:
+        return 0, 0
+
+    ids = team_ids(row[slot] for row in rows for slot in TEAM_SLOTS)
+    keys = {tuple(row[field] for field in NATURAL_KEY[1:]) for row in rows}
+    previous = {
+        (row['match_type'], row['set_number'], row['match_number']): row
+        for row in Match.objects.filter(competition=competition).values('set_number', 'match_number', *STAT_FIELDS)
+    }
+    matches = [
+        Match(
+            competition=competition,
+            **{field: value for field, value in row.items() if field not in TEAM_SLOTS},
+            **{f'{slot}_id': ids[row[slot]] for slot in TEAM_SLOTS},
+        )
+        for row in rows
+    ]
+    update_fields = [field for field in rows[0] if field not in NATURAL_KEY]
+    event_team_ids = {ids[row[slot]] for row in rows for slot in TEAM_SLOTS}
+
+    with transaction.atomic():
+        Match.objects.bulk_create(
+            matches,
+            update_conflicts=True,
+            unique_fields=NATURAL_KEY,
+            update_fields=update_fields,
+        )
+        TeamInfo.objects.bulk_create(
+            [TeamInfo(team_id=team_id, competition=competition) for team_id in event_team_ids],
+            ignore_conflicts=True,
+        )
+        saved = [
+            match for match in Match.objects.filter(competition=competition)
+            if (match.match_type, match.set_number, match.match_number) in keys
+        ]
+        sync_participants(saved)
+        stamp_bulk_data_version(Match, [match.pk for match in saved], competition.pk)
+
+        if incremental:
+            old_rows = [previous[key] for key in keys if key in previous]
+            new_rows = [stat_row(match) for match in saved]
+            apply_deltas(contribution_deltas(
+                combined_contributions(old_rows, match_contributions),
+                combined_contributions(new_rows, match_contributions),
+            ))
+            # Teams new to the event only through unplayed matches get no result delta, so no Ranking row from it
+            ranked = set(Ranking.objects.filter(competition=competition).values_list('team_id', flat=True))
+            unranked = event_team_ids - ranked
+            Ranking.objects.bulk_create([Ranking(team_id=team_id, competition=competition) for team_id in unranked])
+            result_deltas = contribution_deltas(
+                combined_contributions(old_rows, match_results, len(RESULT_FIELDS)),
+                combined_contributions(new_rows, match_results, len(RESULT_FIELDS)),
+                width=len(RESULT_FIELDS),
+            )
+            if result_deltas:
+                apply_result_deltas(result_deltas)  # reranks
+            elif unranked:
+                rerank(competition.pk)
+        else:
+            recompute_competition(competition.pk)
+            recompute_rankings(competition.pk)
+    invalidate(*(team_scope(team_id) for team_id in event_team_ids))
+
+    created = len(keys - previous.keys())
+    return created, len(keys) - created
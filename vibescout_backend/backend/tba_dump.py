@@ -0,0 +1,88 @@
+"""
+Streaming reader for recorded TBA match dumps (e.g. the files in 2020_data/).
+
+Dumps are read in fixed-size chunks and decoded one match at a time with
+json.JSONDecoder.raw_decode, so memory is bounded by the largest single
+match rather than the size of the file.
+"""
+import json
+from pathlib import Path
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = ' \t\n\r'
+NUMBER_CHARS = '0123456789.eE+-'
+
+
+def iter_json_values(file, chunk_size=CHUNK_SIZE):
+    """
+    Yield the elements of a top-level JSON array read from a text file, or
+    each value of a stream of concatenated / newline-delimited JSON values.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    in_array = None  # unknown until the first non-whitespace character
+
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = file.read(chunk_size)
+        buffer = buffer[position:] + chunk
+        position = 0
+        eof = not chunk
+
+    while True:
+        # Skip whitespace and the array punctuation between values
+        while True:
+            while position < len(buffer) and buffer[position] in WHITESPACE:
+                position += 1
+            if position == len(buffer):
+                if eof:
+                    if in_array:
+                        raise ValueError('Unterminated JSON array')
+                    return
+                fill()
+                continue
+            char = buffer[position]
+            if in_array is None:
+                in_array = char == '['
+                if in_array:
+                    position += 1
+                    continue
+            if in_array and char == ',':
+                position += 1
+                continue
+            if in_array and char == ']':
+                return
+            break
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+        if not eof and isinstance(value, (int, float)) and (end == len(buffer) or buffer[end] in NUMBER_CHARS):
+            # A number cut at the end of the buffer, e.g. inside its fraction or exponent, continues in the next chunk
+            fill()
+            continue
+        position = end
+        yield value
+
+
+def dump_files(paths):
+    """JSON files named by `paths`, expanding directories to their *.json files"""
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(path.glob('*.json'))
+        else:
+            yield path
+
+
+def iter_dump_matches(paths, chunk_size=CHUNK_SIZE):
+    """(file, match_data) for every match in the dump files, streamed"""
+    for path in dump_files(paths):
+        with open(path, encoding='utf-8') as file:
+            for match_data in iter_json_values(file, chunk_size):
+                yield path, match_data
@@ -0,0 +1,94 @@
+"""
+Live sync of active events from The Blue Alliance.
+
+Every watched event runs its own asyncio polling loop around sync_event, so
+results are written as incremental diffs and an unchanged event costs a
+single 304. The blocking HTTP request and ORM writes of one poll run in a
+worker thread, so a slow event never delays the others.
+
+The delay before the next poll follows the schedule: short while the next
+unplayed match is due or overdue (its result is about to be posted), longer
+as that match gets further away, and the maximum between sessions or once
+every match has been played. A match still unplayed well past its predicted
+time (a delayed or stale schedule) no longer counts as due. Failed polls
+back off exponentially with jitter, so a TBA outage is not met with
+synchronized retries.
+"""
+import asyncio
+from dataclasses import dataclass
+import random
+import time
+from django.db import close_old_connections
+from .models import Match
+from .tba_sync import sync_event
+
+
+@dataclass
+class PollSchedule:
+    min_interval: float = 10.0     # seconds, around the next match
+    max_interval: float = 300.0    # seconds, between sessions
+    max_backoff: float = 600.0     # seconds, cap of the error backoff
+    overdue_grace: float = 900.0   # seconds a match may run past its predicted time and still count as due
+
+    def next_delay(self, next_match_time, now):
+        """Seconds until the next poll given the predicted time of the next unplayed match (None if none)"""
+        if next_match_time is None or next_match_time < now - self.overdue_grace:
+            return self.max_interval
+        # Poll twice as often as the time left until the match, so polling speeds up as it approaches
+        until = next_match_time - now
+        return min(self.max_interval, max(self.min_interval, until / 2))
+
+    def backoff_delay(self, failures):
+        """Exponential backoff with equal jitter: half the capped delay fixed, half random"""
+        cap = min(self.max_backoff, self.min_interval * 2 ** failures)
+        return cap / 2 + random.uniform(0, cap / 2)
+
+
+def next_match_time(event_key, not_before=0):
+    """Predicted unix time of the next unplayed match of an event predicted at or after `not_before`, or None"""
+    return (
+        Match.objects.filter(
+            competition__code=event_key, has_played=False, predicted_match_time__gt=0,
+            predicted_match_time__gte=not_before,
+        )
+        .order_by('predicted_match_time')
+        .values_list('predicted_match_time', flat=True)
+        .first()
+    )
+
+
+def poll_event(client, event_key, schedule):
+    """One sync of an event, run in a worker thread; returns (sync result, next match time)"""
+    try:
+        # Skip matches left unplayed long past their time so a later match in the schedule can count
+        return sync_event(client, event_key), next_match_time(event_key, time.time() - schedule.overdue_grace)
+    finally:
+        close_old_connections()
+
+
+async def watch_event(client, event_key, schedule, stop, report=print):
+    """Poll one event until `stop` is set"""
+    failures = 0
+    while not stop.is_set():
+        try:
+            result, match_time = await asyncio.to_thread(poll_event, client, event_key, schedule)
+        except Exception as e:
+            failures += 1
+            delay = schedule.backoff_delay(failures)
+            report(f'{event_key}: sync failed ({e}), retrying in {delay:.0f}s')
+        else:
+            failures = 0
+            delay = schedule.next_delay(match_time, time.time())
+            if not result.not_modified:
+                report(
+                    f'{event_key}: {result.changed}/{result.matches} matches changed, '
+                    f'{result.created} created, {result.updated} updated'
+                )
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def watch_events(client, event_keys, schedule, stop, report=print):
+    await asyncio.gather(*(watch_event(client, event_key, schedule, stop, report) for event_key in event_keys))
@@ -0,0 +1,136 @@
+"""
+Incremental sync of events from The Blue Alliance.
+
+Each sync sends a conditional request for the event's matches with the
+ETag/Last-Modified stored from the previous one, so an unchanged event costs
+one 304 and no writes. When TBA does return the match list, every payload is
+hashed and only matches whose hash changed are mapped and written, with their
+aggregates and rankings moved by the difference instead of rebuilt.
+
+TbaClient can record every response it receives into a directory, and the
+serve_tba_recordings command replays such a directory over HTTP (with the
+same ETag/304 behaviour), so syncs can be exercised offline.
+"""
+from dataclasses import dataclass
+import hashlib
+import json
+from pathlib import Path
+import urllib.error
+import urllib.request
+from django.db import transaction
+from django.utils import timezone
+from .models import Competition, TbaSyncState
+from .tba import map_match, upsert_matches
+
+TBA_BASE_URL = 'https://www.thebluealliance.com/api/v3'
+
+
+@dataclass
+class TbaResponse:
+    status: int
+    data: object  # parsed JSON body, None for a 304
+    etag: str
+    last_modified: str
+
+
+def recording_name(path):
+    """File a response for an API path is recorded under, e.g. event__2020gagai__matches.json"""
+    return path.strip('/').replace('/', '__') + '.json'
+
+
+def payload_hash(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+
+class TbaClient:
+    """Minimal TBA API v3 client with conditional requests"""
+
+    def __init__(self, api_key, base_url=TBA_BASE_URL, timeout=10, record_dir=None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.record_dir = Path(record_dir) if record_dir else None
+
+    def get(self, path, etag='', last_modified=''):
+        headers = {'X-TBA-Auth-Key': self.api_key, 'Accept': 'application/json'}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        request = urllib.request.Request(self.base_url + path, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                status, response_headers = response.status, response.headers
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                raise
+            return TbaResponse(304, None, e.headers.get('ETag') or etag, e.headers.get('Last-Modified') or last_modified)
+
+        data = json.loads(body)
+        result = TbaResponse(status, data, response_headers.get('ETag', ''), response_headers.get('Last-Modified', ''))
+        if self.record_dir:
+            self.record_dir.mkdir(parents=True, exist_ok=True)
+            (self.record_dir / recording_name(path)).write_text(json.dumps({
+                'headers': {'ETag': result.etag, 'Last-Modified': result.last_modified},
+                'body': data,
+            }))
+        return result
+
+
+@dataclass
+class SyncResult:
+    event_key: str
+    not_modified: bool = False
+    matches: int = 0   # matches in the upstream payload
+    changed: int = 0   # matches whose payload hash changed
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0   # changed matches without three teams per alliance
+
+
+def sync_event(client, event_key):
+    """Bring one event up to date with TBA, writing only the matches that changed upstream"""
+    state = TbaSyncState.objects.filter(event_key=event_key).select_related('competition').first()
+    result = SyncResult(event_key)
+
+    response = client.get(
+        f'/event/{event_key}/matches',
+        etag=state.etag if state else '',
+        last_modified=state.last_modified if state else '',
+    )
+    if response.status == 304:
+        result.not_modified = True
+        return result
+
+    if state:
+        competition = state.competition
+    else:
+        competition = Competition.objects.filter(code=event_key).first()
+        if competition is None:
+            event_info = client.get(f'/event/{event_key}').data
+            competition = Competition.objects.create(code=event_key, name=event_info['name'])
+        state = TbaSyncState(event_key=event_key, competition=competition)
+
+    hashes = {match_data['key']: payload_hash(match_data) for match_data in response.data}
+    changed = [match_data for match_data in response.data if state.match_hashes.get(match_data['key']) != hashes[match_data['key']]]
+    result.matches = len(response.data)
+    result.changed = len(changed)
+
+    rows = []
+    for match_data in changed:
+        row = map_match(match_data)
+        if row is None:
+            result.skipped += 1
+        else:
+            rows.append(row)
+
+    with transaction.atomic():
+        # The first sync of an event rebuilds its stats once; later ones move them by the changed matches only
+        result.created, result.updated = upsert_matches(competition, rows, incremental=state.pk is not None)
+        state.etag = response.etag
+        state.last_modified = response.last_modified
+        state.match_hashes = hashes
+        state.synced_at = timezone.now()
+        state.save()
+    return result
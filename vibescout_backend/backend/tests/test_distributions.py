@@ -0,0 +1,26 @@
+import io
+from django.core.management import call_command
+from django.test import TestCase
+from backend.models import Competition, Team, TeamInfo
+
+
+class MetricDistributionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('generate_competition', teams=24, qual_matches=4, stdout=io.StringIO())
+        # Registered for the event but yet to play, so its averages are empty
+        team = Team.objects.create(number=99999, name='Late Registration')
+        TeamInfo.objects.create(team=team, competition=Competition.objects.get(code='TEST2026'))
+
+    def test_team_source_skips_teams_that_have_not_played(self):
+        response = self.client.get(
+            '/api/metrics/distribution?metric=fuel_scored&source=team&competition_code=TEST2026', HTTP_HOST='localhost',
+        )
+        self.assertEqual(response.status_code, 200)
+        distribution = response.json()
+
+        played = list(TeamInfo.objects.filter(matches_played__gt=0).values_list('avg_fuel_scored', flat=True))
+        self.assertEqual(distribution['count'], len(played))
+        self.assertAlmostEqual(distribution['mean'], sum(played) / len(played))
+        self.assertNotIn(99999, [team['team_number'] for team in distribution['teams']])
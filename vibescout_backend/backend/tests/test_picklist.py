@@ -0,0 +1,45 @@
+from django.test import TestCase
+from backend.models import Team, Competition, TeamInfo
+from backend.analytics.picklist import load_model, top_alliances
+
+# team number -> (avg_auto_fuel, avg_fuel_scored, avg_climb_points)
+AVERAGES = {
+    1: (8.0, 8.0, 0.0),
+    2: (7.0, 7.0, 0.0),
+    3: (6.0, 6.0, 0.0),
+    4: (0.0, 5.0, 0.0),
+    5: (0.0, 4.0, 0.0),
+    6: (0.0, 0.0, 3.0),
+}
+
+
+class PickListTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.competition = Competition.objects.create(name='Pick List', code='PICK')
+        for number, (auto, fuel, climb) in AVERAGES.items():
+            TeamInfo.objects.create(
+                team=Team.objects.create(number=number, name=f'Team {number}'),
+                competition=cls.competition,
+                avg_auto_fuel=auto,
+                avg_fuel_scored=fuel,
+                avg_climb_points=climb,
+            )
+
+    def best_alliance(self, **weights):
+        model = load_model(self.competition.pk, weights)
+        (_, teams), = top_alliances(model, k=1)
+        return sorted(model.team_numbers[i] for i in teams)
+
+    def test_auto_fuel_is_not_counted_as_teleop(self):
+        model = load_model(self.competition.pk)
+        vectors = dict(zip(model.team_numbers, model.vectors))
+
+        self.assertEqual(vectors[1], (8.0, 0.0, 0.0))
+        self.assertEqual(vectors[4], (0.0, 5.0, 0.0))
+
+    def test_teleop_weight_changes_best_alliance(self):
+        self.assertEqual(self.best_alliance(), [1, 2, 4])
+        self.assertEqual(self.best_alliance(teleop_fuel=5.0), [1, 4, 5])
+        self.assertEqual(self.best_alliance(teleop_fuel=0.0, climb_points=0.0), [1, 2, 3])
@@ -0,0 +1,36 @@
+import io
+from django.core.management import call_command
+from django.test import TestCase
+from backend.models import Competition, Match, Ranking, TeamInfo
+from backend.profiles import season_aggregates
+
+
+class SeasonAggregateTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('generate_competition', teams=24, qual_matches=4, stdout=io.StringIO())
+        cls.competition = Competition.objects.get(code='TEST2026')
+        # A playoff team that did not finish first, so a rank-1 event without played matches would win
+        playoff = Match.objects.filter(competition=cls.competition).exclude(match_type='qualification').first()
+        cls.team = playoff.red_team_1 if playoff.blue_team_1.rankings.get().rank == 1 else playoff.blue_team_1
+        upcoming = Competition.objects.create(name='Upcoming Event', code='AAA2026')
+        TeamInfo.objects.create(team=cls.team, competition=upcoming)
+
+    def test_best_event_skips_events_without_played_matches(self):
+        self.assertEqual(Ranking.objects.get(team=self.team, competition__code='AAA2026').rank, 1)
+
+        season = season_aggregates([self.team])[self.team.pk]
+
+        self.assertEqual(season['best_event_code'], 'TEST2026')
+        self.assertEqual(season['best_rank'], Ranking.objects.get(team=self.team, competition=self.competition).rank)
+
+    def test_win_loss_tie_add_up_to_qualification_matches(self):
+        season = season_aggregates([self.team])[self.team.pk]
+
+        self.assertEqual(season['qualification_matches'], season['wins'] + season['losses'] + season['ties'])
+        self.assertEqual(
+            season['qualification_matches'],
+            Match.objects.filter(participants__team=self.team, match_type='qualification', has_played=True).count(),
+        )
+        self.assertGreater(season['matches_played'], season['qualification_matches'])
@@ -0,0 +1,40 @@
+import io
+from django.core.management import call_command
+from django.test import TransactionTestCase
+from backend.models import Team, Competition, TeamInfo, Match, Ranking
+from backend.analytics.aggregates import recompute_competition
+from backend.analytics.rankings import recompute_rankings
+
+
+def standings(competition):
+    return (
+        sorted(TeamInfo.objects.filter(competition=competition).values_list(
+            'team__number', 'matches_played', 'total_fuel_scored', 'ranking_points', 'win', 'lose', 'tie'
+        )),
+        sorted(Ranking.objects.filter(competition=competition).values_list(
+            'team__number', 'rank', 'matches_played', 'ranking_points', 'wins', 'losses', 'ties', 'total_fuel_scored'
+        )),
+    )
+
+
+class TeamDeleteTests(TransactionTestCase):
+    # TransactionTestCase so the rebuild queued with on_commit actually runs
+
+    def setUp(self):
+        call_command('generate_competition', teams=24, qual_matches=4, stdout=io.StringIO())
+        self.competition = Competition.objects.get(code='TEST2026')
+
+    def test_deleting_team_with_played_matches(self):
+        team = Match.objects.filter(competition=self.competition, has_played=True).first().blue_team_1
+        team.delete()
+
+        self.assertFalse(Ranking.objects.filter(team_id=team.pk).exists())
+        self.assertFalse(Match.objects.filter(blue_team_1_id=team.pk).exists())
+        incremental = standings(self.competition)
+        recompute_competition(self.competition.pk)
+        recompute_rankings(self.competition.pk)
+        self.assertEqual(incremental, standings(self.competition))
+        self.assertEqual(
+            sorted(rank for _, rank, *_ in incremental[1]),
+            list(range(1, len(incremental[1]) + 1)),
+        )
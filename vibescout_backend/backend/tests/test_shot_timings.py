@@ -0,0 +1,73 @@
+import io
+import json
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase
+from backend import api
+from backend.models import Competition, Match, ShotTiming
+
+
+class ShotTimingBatchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('generate_competition', teams=24, qual_matches=4, stdout=io.StringIO())
+        cls.match = Match.objects.filter(competition__code='TEST2026', match_type='qualification').first()
+
+    def item(self, key, start=10.0):
+        return {
+            'match_number': self.match.match_number,
+            'team_number': self.match.blue_team_1.number,
+            'start_shot_time': start,
+            'end_shot_time': start + 2,
+            'idempotency_key': key,
+        }
+
+    def post(self, items):
+        response = self.client.post(
+            '/api/shot-timings/batch?competition_code=TEST2026',
+            json.dumps(items), content_type='application/json', HTTP_HOST='localhost',
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_retried_batch_counts_duplicates(self):
+        first = self.post([self.item('a'), self.item('b', 20.0), self.item('a')])
+        retry = self.post([self.item('a'), self.item('b', 20.0)])
+
+        self.assertEqual((first['created'], first['duplicates']), (2, 1))
+        self.assertEqual((retry['created'], retry['duplicates']), (0, 2))
+        self.assertEqual(ShotTiming.objects.count(), 2)
+
+    def test_keys_stored_concurrently_are_not_counted_as_created(self):
+        real_bump = api.bump_data_version
+
+        def bump_after_concurrent_insert(competition_id):
+            # Another upload stores key 'a' between the duplicate lookup and the insert
+            ShotTiming.objects.bulk_create([ShotTiming(
+                match=self.match, team=self.match.blue_team_1,
+                start_shot_time=10.0, end_shot_time=12.0, idempotency_key='a',
+            )])
+            return real_bump(competition_id)
+
+        with mock.patch.object(api, 'bump_data_version', bump_after_concurrent_insert):
+            result = self.post([self.item('a'), self.item('b', 20.0), self.item(None, 30.0)])
+
+        self.assertEqual((result['created'], result['duplicates']), (2, 1))
+        self.assertEqual(ShotTiming.objects.count(), 3)
+
+    def test_rows_of_another_competition_at_the_same_version_are_not_counted(self):
+        # Data versions are counted per competition, so another one can reach the version this batch gets
+        call_command('generate_competition', code='OTHER2026', teams=24, qual_matches=4, stdout=io.StringIO())
+        other_match = Match.objects.filter(competition__code='OTHER2026').first()
+        next_version = Competition.objects.get(code='TEST2026').data_version + 1
+        other = ShotTiming.objects.create(
+            match=other_match, team=other_match.blue_team_1, start_shot_time=10.0, end_shot_time=12.0,
+        )
+        # Saving stamps the other competition's own version, so set the clashing one afterwards
+        ShotTiming.objects.filter(pk=other.pk).update(data_version=next_version)
+
+        result = self.post([self.item('a')])
+
+        self.assertEqual((result['created'], result['duplicates']), (1, 0))
+        self.assertEqual(ShotTiming.objects.filter(data_version=next_version).count(), 2)
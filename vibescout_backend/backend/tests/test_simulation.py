@@ -0,0 +1,57 @@
+import io
+import numpy as np
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from backend.models import Competition, Match, Ranking
+from backend.analytics import simulation
+from backend.analytics.simulation import load_projection_inputs, project_rankings
+
+
+class RankProjectionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('generate_competition', teams=24, qual_matches=4, stdout=io.StringIO())
+        cls.competition = Competition.objects.get(code='TEST2026')
+
+    def test_projection_without_remaining_matches_matches_ranking_order(self):
+        # Ties in RP and wins are common in a short event, so this exercises the fuel and team number tiebreakers
+        inputs = load_projection_inputs(self.competition.pk)
+        projection = project_rankings(inputs, runs=50, seed=1)
+
+        self.assertEqual(projection.remaining_matches, 0)
+        projected = dict(zip(projection.team_numbers.tolist(), np.argmax(projection.rank_counts, axis=1) + 1))
+        actual = dict(Ranking.objects.filter(competition=self.competition).values_list('team__number', 'rank'))
+        self.assertEqual(projected, actual)
+
+    def test_decided_standings_project_to_their_ranking_through_the_endpoint(self):
+        response = self.client.get('/api/competitions/TEST2026/rank-projection?runs=100', HTTP_HOST='localhost')
+
+        self.assertEqual(response.status_code, 200)
+        projected = {team['team_number']: team['expected_rank'] for team in response.json()['teams']}
+        actual = dict(Ranking.objects.filter(competition=self.competition).values_list('team__number', 'rank'))
+        self.assertEqual(projected, {number: float(rank) for number, rank in actual.items()})
+
+    @staticmethod
+    def close_pool():
+        if simulation._pool is not None:
+            simulation._pool.shutdown()
+            simulation._pool = None
+
+    def test_seeded_projection_does_not_depend_on_the_worker_count(self):
+        Match.objects.filter(competition=self.competition, match_type='qualification', match_number__gt=8).update(has_played=False)
+        inputs = load_projection_inputs(self.competition.pk)
+        self.assertGreater(len(inputs.schedule), 0)
+        self.addCleanup(self.close_pool)
+
+        # Several chunks, so the pool is used when there is one
+        runs = simulation.CHUNK_SIZE * 2 + 500
+        projections = []
+        for workers in (1, 2):
+            with override_settings(PROJECTION_WORKERS=workers):
+                self.assertEqual(simulation.shared_pool() is not None, workers > 1)
+                projections.append(project_rankings(inputs, runs=runs, seed=7))
+
+        in_process, pooled = projections
+        np.testing.assert_array_equal(in_process.rank_counts, pooled.rank_counts)
+        np.testing.assert_array_equal(in_process.rp_gain_counts, pooled.rp_gain_counts)
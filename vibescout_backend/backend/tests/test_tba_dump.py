@@ -0,0 +1,100 @@
+import io
+import json
+from pathlib import Path
+import shutil
+import tempfile
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from backend.analytics.aggregates import recompute_competition
+from backend.analytics.rankings import recompute_rankings
+from backend.models import Competition, Match, Ranking, TeamInfo
+from backend.tba_dump import iter_json_values
+
+RECORDED_MATCHES = settings.BASE_DIR.parent / '2020_data' / 'response_1768966380436.json'
+
+
+class IterJsonValuesTests(SimpleTestCase):
+    """Chunk sizes down to one character, so every value is split across reads"""
+
+    CHUNK_SIZES = [1, 2, 3, 7, 64]
+
+    def parse(self, text, chunk_size):
+        return list(iter_json_values(io.StringIO(text), chunk_size))
+
+    def test_array_elements(self):
+        text = '[{"name": "a}b{,]", "teams": [1, 2]}, "]", 123456, -3.5e2 , true, null, {}]'
+        for chunk_size in self.CHUNK_SIZES:
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(
+                    self.parse(text, chunk_size),
+                    [{'name': 'a}b{,]', 'teams': [1, 2]}, ']', 123456, -350.0, True, None, {}],
+                )
+
+    def test_concatenated_and_newline_delimited_values(self):
+        # The trailing number ends the file, so it must not be cut at a chunk boundary
+        text = ' \n{"key": "qm1"}{"key": "qm2"}\n\n\t{"key": "}"}\r\n 123456'
+        for chunk_size in self.CHUNK_SIZES:
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.parse(text, chunk_size), [{'key': 'qm1'}, {'key': 'qm2'}, {'key': '}'}, 123456])
+
+    def test_recorded_dump(self):
+        text = RECORDED_MATCHES.read_text()
+        self.assertEqual(self.parse(text, 5), json.loads(text))
+
+    def test_empty_input(self):
+        self.assertEqual(self.parse('', 3), [])
+        self.assertEqual(self.parse(' \n ', 3), [])
+        self.assertEqual(self.parse('[ ]', 1), [])
+
+    def test_truncated_trailing_value_raises_after_complete_ones(self):
+        for text in ['[{"key": "qm1"}, {"key": "q', '{"key": "qm1"}\n{"key": ']:
+            for chunk_size in self.CHUNK_SIZES:
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    values = iter_json_values(io.StringIO(text), chunk_size)
+                    self.assertEqual(next(values), {'key': 'qm1'})
+                    with self.assertRaises(json.JSONDecodeError):
+                        next(values)
+
+    def test_unterminated_array_raises(self):
+        with self.assertRaisesMessage(ValueError, 'Unterminated JSON array'):
+            self.parse('[1, 2 ', 2)
+
+
+class ImportTbaDumpTests(TestCase):
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        matches = [match for match in json.loads(RECORDED_MATCHES.read_text()) if match['comp_level'] == 'qm'][:24]
+        # One event split over an array dump and a newline-delimited one
+        (self.directory / 'part1.json').write_text(json.dumps(matches[:10], indent=2))
+        (self.directory / 'part2.json').write_text('\n'.join(json.dumps(match) for match in matches[10:]))
+        self.matches = matches
+
+    def standings(self, competition):
+        return (
+            sorted(TeamInfo.objects.filter(competition=competition).values_list(
+                'team__number', 'matches_played', 'total_fuel_scored', 'total_climb_points', 'ranking_points', 'win',
+            )),
+            sorted(Ranking.objects.filter(competition=competition).values_list(
+                'team__number', 'rank', 'ranking_points', 'wins', 'losses', 'ties', 'matches_played',
+            )),
+        )
+
+    def test_import_matches_a_rebuild_and_reimport_only_updates(self):
+        # Batches smaller than a file, so stats are moved batch by batch
+        call_command('import_tba_dump', str(self.directory), batch_size=7, stdout=io.StringIO())
+        competition = Competition.objects.get(code='2020gagai')
+        self.assertEqual(Match.objects.filter(competition=competition).count(), len(self.matches))
+
+        imported = self.standings(competition)
+        recompute_competition(competition.pk)
+        recompute_rankings(competition.pk)
+        self.assertEqual(imported, self.standings(competition))
+
+        output = io.StringIO()
+        call_command('import_tba_dump', str(self.directory / 'part1.json'), str(self.directory / 'part2.json'), stdout=output)
+        self.assertIn(f'2020gagai: 0 created, {len(self.matches)} updated', output.getvalue())
+        self.assertEqual(Match.objects.filter(competition=competition).count(), len(self.matches))
+        self.assertEqual(imported, self.standings(competition))
@@ -0,0 +1,31 @@
+import io
+from django.core.management import call_command
+from django.test import TestCase
+from backend.models import Match
+from backend.tba_live import PollSchedule, next_match_time
+
+
+class PollScheduleTests(TestCase):
+
+    def test_delay_follows_next_match(self):
+        schedule = PollSchedule(min_interval=10, max_interval=300, overdue_grace=900)
+
+        self.assertEqual(schedule.next_delay(None, 1000), 300)
+        self.assertEqual(schedule.next_delay(1400, 1000), 200)
+        self.assertEqual(schedule.next_delay(1010, 1000), 10)
+        self.assertEqual(schedule.next_delay(900, 1000), 10)   # overdue, result about to post
+
+    def test_stale_match_does_not_pin_fastest_rate(self):
+        schedule = PollSchedule(min_interval=10, max_interval=300, overdue_grace=900)
+
+        self.assertEqual(schedule.next_delay(1000, 1000 + 901), 300)
+
+    def test_next_match_skips_stale_matches(self):
+        call_command('generate_competition', teams=24, qual_matches=4, stdout=io.StringIO())
+        first, second = Match.objects.filter(competition__code='TEST2026').order_by('pk')[:2]
+        Match.objects.filter(competition__code='TEST2026').update(has_played=True)
+        Match.objects.filter(pk=first.pk).update(has_played=False, predicted_match_time=1000)
+        Match.objects.filter(pk=second.pk).update(has_played=False, predicted_match_time=5000)
+
+        self.assertEqual(next_match_time('TEST2026'), 1000)
+        self.assertEqual(next_match_time('TEST2026', not_before=2000), 5000)
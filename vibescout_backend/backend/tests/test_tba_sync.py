@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from backend.analytics.aggregates import recompute_competition
+from backend.analytics.rankings import recompute_rankings
+from backend.management.commands.serve_tba_recordings import RecordingHandler
+from backend.models import Competition, Match, Ranking, TeamInfo
+from backend.tba_sync import TbaClient, recording_name, sync_event
+
+EVENT_KEY = '2020gagai'
+RECORDED_MATCHES = settings.BASE_DIR.parent / '2020_data' / 'response_1768966380436.json'
+
+
+class IncrementalSyncTests(TestCase):
+    """sync_event against recorded TBA responses replayed by the serve_tba_recordings handler"""
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.matches = json.loads(RECORDED_MATCHES.read_text())
+        self.record(f'/event/{EVENT_KEY}', {'key': EVENT_KEY, 'name': 'Georgia Gainesville'})
+        self.record_matches()
+
+        handler = type('Handler', (RecordingHandler,), {'directory': self.directory, 'log_message': lambda *args: None})
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.client = TbaClient('test', base_url=f'http://127.0.0.1:{server.server_port}/api/v3')
+
+    def record(self, path, body):
+        (self.directory / recording_name(path)).write_text(json.dumps({'headers': {}, 'body': body}))
+
+    def record_matches(self):
+        self.record(f'/event/{EVENT_KEY}/matches', self.matches)
+
+    def standings(self, competition):
+        return (
+            sorted(TeamInfo.objects.filter(competition=competition).values_list(
+                'team__number', 'matches_played', 'total_fuel_scored', 'total_climb_points', 'ranking_points', 'win', 'avg_fuel_scored',
+            )),
+            sorted(Ranking.objects.filter(competition=competition).values_list(
+                'team__number', 'rank', 'ranking_points', 'wins', 'losses', 'ties', 'total_fuel_scored', 'matches_played',
+            )),
+        )
+
+    def test_unchanged_event_writes_nothing(self):
+        first = sync_event(self.client, EVENT_KEY)
+        competition = Competition.objects.get(code=EVENT_KEY)
+        self.assertEqual(first.created, len(self.matches) - first.skipped)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = sync_event(self.client, EVENT_KEY)
+
+        self.assertTrue(result.not_modified)
+        self.assertEqual([query['sql'] for query in queries if not query['sql'].startswith('SELECT')], [])
+        self.assertEqual(Competition.objects.get(code=EVENT_KEY).data_version, competition.data_version)
+
+    def test_changed_matches_move_stats_like_a_rebuild(self):
+        sync_event(self.client, EVENT_KEY)
+        competition = Competition.objects.get(code=EVENT_KEY)
+        versions = dict(Match.objects.filter(competition=competition).values_list('pk', 'data_version'))
+
+        # Upstream corrects a qualification score and a climb
+        edited = [match for match in self.matches if match['comp_level'] == 'qm'][:2]
+        edited[0]['alliances']['blue']['score'] += 50
+        edited[0]['score_breakdown']['blue']['teleopCellsOuter'] += 9
+        edited[1]['score_breakdown']['red']['endgameRobot1'] = 'Hang'
+        self.record_matches()
+
+        result = sync_event(self.client, EVENT_KEY)
+
+        self.assertEqual((result.changed, result.created, result.updated), (2, 0, 2))
+        restamped = {
+            pk for pk, version in Match.objects.filter(competition=competition).values_list('pk', 'data_version')
+            if version != versions[pk]
+        }
+        self.assertEqual(len(restamped), 2)
+        self.assertEqual(
+            {(match['match_number'], match['comp_level']) for match in edited},
+            {(match.match_number, 'qm') for match in Match.objects.filter(pk__in=restamped)},
+        )
+
+        incremental = self.standings(competition)
+        recompute_competition(competition.pk)
+        recompute_rankings(competition.pk)
+        self.assertEqual(incremental, self.standings(competition))
@@ -0,0 +1,55 @@
+import io
+from django.core.management import call_command
+from django.test import TestCase
+from backend.models import Team, Competition, TeamInfo
+
+
+class EditInvalidationTests(TestCase):
+    # Covers the ETag (data version) and the scoped response cache together
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('generate_competition', teams=24, qual_matches=4, stdout=io.StringIO())
+        cls.competition = Competition.objects.get(code='TEST2026')
+        cls.team = TeamInfo.objects.filter(competition=cls.competition).first().team
+
+    def get(self, path, **headers):
+        return self.client.get(path, HTTP_HOST='localhost', **headers)
+
+    def test_team_rename_refreshes_cached_responses(self):
+        teams = self.get('/api/competitions/TEST2026/teams')
+        matches = self.get('/api/competitions/TEST2026/matches')
+        self.assertIn(self.team.name, {team['name'] for team in teams.json()})
+
+        self.team.name = 'Renamed Robotics'
+        self.team.save()
+
+        names = {team['name'] for team in self.get('/api/competitions/TEST2026/teams').json()}
+        self.assertIn('Renamed Robotics', names)
+        revalidated = self.get('/api/competitions/TEST2026/matches', HTTP_IF_NONE_MATCH=matches['ETag'])
+        self.assertEqual(revalidated.status_code, 200)
+        self.assertNotEqual(revalidated['ETag'], matches['ETag'])
+
+    def test_team_rename_reaches_delta_sync(self):
+        version = self.get('/api/competitions/TEST2026/sync').json()['version']
+
+        Team.objects.filter(pk=self.team.pk).update(number=99999)
+        self.team.refresh_from_db()
+        self.team.save()
+
+        delta = self.get(f'/api/competitions/TEST2026/sync?since={version}').json()
+        self.assertEqual([row['team']['number'] for row in delta['team_info']], [99999])
+
+    def test_competition_edit_changes_etag(self):
+        team_info = self.get('/api/team-info?competition_code=TEST2026')
+        stale = Competition.objects.get(pk=self.competition.pk)
+        self.team.save()  # bumps the version after `stale` was loaded
+        bumped = Competition.objects.get(pk=self.competition.pk).data_version
+
+        stale.name = 'Renamed Event'
+        stale.save()
+
+        revalidated = self.get('/api/team-info?competition_code=TEST2026', HTTP_IF_NONE_MATCH=team_info['ETag'])
+        self.assertEqual(revalidated.status_code, 200)
+        self.assertEqual({row['competition']['name'] for row in revalidated.json()}, {'Renamed Event'})
+        self.assertGreater(Competition.objects.get(pk=self.competition.pk).data_version, bumped)
@@ -0,0 +1,113 @@
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.http import HttpResponseNotModified
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from .models import Team, Competition, TeamInfo, Match, MatchParticipant, DeletedRecord
+
+
+def bump_data_version(competition_id):
+    """Increment the data version of a competition and return the new value"""
+    with transaction.atomic():
+        Competition.objects.filter(pk=competition_id).update(
+            data_version=F('data_version') + 1,
+            data_updated_at=timezone.now(),
+        )
+        return Competition.objects.filter(pk=competition_id).values_list('data_version', flat=True).first()
+
+
+def stamp_data_version(instance, competition_id):
+    """
+    Bump the competition version and record it on a changed row in the same
+    transaction, so a delta reader never sees the new version without the row.
+    """
+    with transaction.atomic():
+        version = bump_data_version(competition_id)
+        type(instance).objects.filter(pk=instance.pk).update(data_version=version)
+    instance.data_version = version
+    return version
+
+
+def stamp_bulk_data_version(model, pks, competition_id):
+    """
+    Bump the competition version once for rows written with bulk_create or
+    bulk_update (which skip model signals) and stamp all of them with it.
+    """
+    with transaction.atomic():
+        version = bump_data_version(competition_id)
+        model.objects.filter(pk__in=pks).update(data_version=version)
+    return version
+
+
+def stamp_team_change(team_id):
+    """
+    Bump every competition a team appears in and restamp its TeamInfo and
+    match rows there, since they embed the team's number and name. Returns
+    the affected competition ids.
+    """
+    competition_ids = set(TeamInfo.objects.filter(team_id=team_id).values_list('competition_id', flat=True))
+    competition_ids |= set(
+        MatchParticipant.objects.filter(team_id=team_id).values_list('competition_id', flat=True).distinct()
+    )
+    for competition_id in competition_ids:
+        with transaction.atomic():
+            version = bump_data_version(competition_id)
+            TeamInfo.objects.filter(competition_id=competition_id, team_id=team_id).update(data_version=version)
+            Match.objects.filter(competition_id=competition_id, participants__team_id=team_id).update(
+                data_version=version
+            )
+    return competition_ids
+
+
+def record_deletion(competition_id, model, key):
+    """Bump the competition version and leave a tombstone for a deleted row"""
+    with transaction.atomic():
+        version = bump_data_version(competition_id)
+        if version is not None:
+            DeletedRecord.objects.create(
+                competition_id=competition_id,
+                model=model,
+                key=key,
+                data_version=version,
+            )
+    return version
+
+
+def is_competition_cascade(origin):
+    """True when a delete signal was triggered by deleting the competition itself"""
+    if isinstance(origin, QuerySet):
+        return origin.model is Competition
+    return isinstance(origin, Competition)
+
+
+def is_team_cascade(origin):
+    """True when a delete signal was triggered by deleting a team"""
+    if isinstance(origin, QuerySet):
+        return origin.model is Team
+    return isinstance(origin, Team)
+
+
+def competition_etag(competition):
+    return f'"{competition.pk}-{competition.data_version}"'
+
+
+def conditional_response(request, response, competition):
+    """
+    Set ETag/Last-Modified headers for a competition-scoped read and return a
+    304 response when the client's copy is still current, otherwise None.
+    """
+    etag = competition_etag(competition)
+    last_modified = None
+    response['ETag'] = etag
+    if competition.data_updated_at:
+        last_modified = int(competition.data_updated_at.timestamp())
+        response['Last-Modified'] = http_date(last_modified)
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if isinstance(not_modified, HttpResponseNotModified):
+        for header in ('ETag', 'Last-Modified'):
+            if header in response:
+                not_modified[header] = response[header]
+        return not_modified
+    return None